@@ -0,0 +1,332 @@
+import math
+import numpy as np
+
+# 采样宽度(字节) -> NumPy 数据类型（与 pydub 内部的 PCM 数据格式一致）
+SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+# 音频录制要求（见 README）
+TARGET_VOLUME_DB = (-9.0, -6.0)  # 音量
+NOISE_FLOOR_LIMIT_DB = -30.0  # 底噪上限
+CLIPPING_DB = -0.1  # 采样峰值达到该值视为削波
+TARGET_FRAME_RATE = 48000  # 采样率
+TARGET_SAMPLE_WIDTH = 2  # 比特率 16bit（采样宽度，字节）
+TARGET_CHANNELS = 1  # 单声道
+
+# 电平计算的块长（秒），实时电平监测、质量检查与波形包络共用
+LEVEL_BLOCK_SECONDS = 0.01
+
+def check_level_targets(max_volume, noise_floor, peak=None):
+    """
+    检查音量、底噪与峰值是否符合录制要求。
+
+    参数:
+        max_volume (float): 最大音量(dB)
+        noise_floor (float): 底噪(dB)
+        peak (float): 采样峰值(dBFS)，默认为 None（不检查削波）
+
+    返回值:
+        list: 不符合要求的提示文本列表，全部符合时为空列表
+    """
+    warnings = []
+    if peak is not None and peak >= CLIPPING_DB:
+        warnings.append("削波")
+    if max_volume > TARGET_VOLUME_DB[1]:
+        warnings.append("音量过大")
+    elif max_volume < TARGET_VOLUME_DB[0]:
+        warnings.append("音量过小")
+    if noise_floor >= NOISE_FLOOR_LIMIT_DB:
+        warnings.append("底噪过高")
+    return warnings
+
+def noise_floor(levels):
+    """
+    以各块电平的第 10 百分位估计底噪。
+
+    参数:
+        levels (np.ndarray): 按 LEVEL_BLOCK_SECONDS 分块计算的电平(dB)
+
+    返回值:
+        float: 底噪(dB)，没有数据时为 -inf
+    """
+    if len(levels) == 0:
+        return -float('inf')
+    return float(np.percentile(levels, 10))
+
+def audio_segment_to_array(audio_segment):
+    """
+    将 AudioSegment 的 PCM 数据转换为 NumPy 数组（不复制数据）。
+
+    参数:
+        audio_segment (AudioSegment): 音频
+
+    返回值:
+        np.ndarray: 形状为 (帧数, 声道数) 的整数数组
+    """
+    samples = np.frombuffer(audio_segment.raw_data, dtype=SAMPLE_DTYPES[audio_segment.sample_width])
+    return samples.reshape(-1, audio_segment.channels)
+
+def frame_energy_cumsum(samples):
+    """
+    计算逐帧能量（所有声道平方和）的前缀和，首元素为 0。
+
+    参数:
+        samples (np.ndarray): 形状为 (帧数, 声道数) 的整数数组
+
+    返回值:
+        np.ndarray: 长度为 帧数+1 的前缀和数组
+    """
+    # 16 位及以下使用 int64 精确累加；32 位平方和可能溢出，改用 float64
+    acc_dtype = np.int64 if samples.dtype.itemsize <= 2 else np.float64
+    energy = np.square(samples, dtype=acc_dtype).sum(axis=1, dtype=acc_dtype)
+    cumsum = np.empty(len(energy) + 1, dtype=acc_dtype)
+    cumsum[0] = 0
+    np.cumsum(energy, out=cumsum[1:])
+    return cumsum
+
+def detect_silence_array(samples, frame_rate, sample_width, min_silence_len=1000, silence_thresh=-16, seek_step=1):
+    """
+    向量化的静音检测，结果与 pydub.silence.detect_silence 一致。
+
+    对每个起点 i（毫秒）的 [i, i + min_silence_len) 窗口，通过能量前缀和一次性求出
+    所有窗口的 RMS，再与阈值比较并合并为连续区间。
+
+    参数:
+        samples (np.ndarray): 形状为 (帧数, 声道数) 的整数数组
+        frame_rate (int): 采样率
+        sample_width (int): 采样宽度(字节)
+        min_silence_len (int): 最短静音时长(毫秒)，默认1000ms
+        silence_thresh (int 或 float): 静音阈值(dBFS)，默认-16dB
+        seek_step (int): 检测步长(毫秒)，默认1ms
+
+    返回值:
+        list: 静音区间列表 [[开始, 结束], ...]（毫秒）
+    """
+    n_frames, channels = samples.shape
+    seg_len = round(1000 * (n_frames / frame_rate))
+
+    # 音频比最短静音时长还短时不可能存在静音
+    if seg_len < min_silence_len:
+        return []
+
+    # 将 dBFS 阈值换算为振幅
+    max_possible_amplitude = (2 ** (sample_width * 8)) / 2
+    thresh = 10 ** (float(silence_thresh) / 20) * max_possible_amplitude
+
+    # 所有窗口起点（保证包含最后一个窗口）
+    last_slice_start = seg_len - min_silence_len
+    slice_starts = np.arange(0, last_slice_start + 1, seek_step, dtype=np.int64)
+    if last_slice_start % seek_step:
+        slice_starts = np.append(slice_starts, last_slice_start)
+
+    # 毫秒 -> 帧，与 AudioSegment 切片的取整方式一致；超出末尾的部分按零填充
+    ms_to_frames = frame_rate / 1000.0
+    start_frames = (slice_starts * ms_to_frames).astype(np.int64)
+    end_frames = ((slice_starts + min_silence_len) * ms_to_frames).astype(np.int64)
+    cumsum = frame_energy_cumsum(samples)
+    energy = cumsum[np.minimum(end_frames, n_frames)] - cumsum[np.minimum(start_frames, n_frames)]
+    counts = (end_frames - start_frames) * channels
+
+    # audioop.rms 的结果向下取整为整数
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rms = np.floor(np.sqrt(energy / counts))
+    rms[counts == 0] = 0
+    silence_starts = slice_starts[rms <= thresh]
+
+    if len(silence_starts) == 0:
+        return []
+
+    # 合并相邻或重叠的静音窗口
+    gaps = np.diff(silence_starts)
+    breaks = np.flatnonzero((gaps != seek_step) & (gaps > min_silence_len))
+    range_starts = np.concatenate(([silence_starts[0]], silence_starts[breaks + 1]))
+    range_ends = np.concatenate((silence_starts[breaks], [silence_starts[-1]])) + min_silence_len
+    return [[int(start), int(end)] for start, end in zip(range_starts, range_ends)]
+
+def detect_nonsilent_array(samples, frame_rate, sample_width, min_silence_len=1000, silence_thresh=-16, seek_step=1):
+    """
+    向量化的非静音检测，结果与 pydub.silence.detect_nonsilent 一致。
+
+    参数:
+        samples (np.ndarray): 形状为 (帧数, 声道数) 的整数数组
+        frame_rate (int): 采样率
+        sample_width (int): 采样宽度(字节)
+        min_silence_len (int): 最短静音时长(毫秒)，默认1000ms
+        silence_thresh (int 或 float): 静音阈值(dBFS)，默认-16dB
+        seek_step (int): 检测步长(毫秒)，默认1ms
+
+    返回值:
+        list: 非静音区间列表 [[开始, 结束], ...]（毫秒）
+    """
+    silent_ranges = detect_silence_array(samples, frame_rate, sample_width, min_silence_len, silence_thresh, seek_step)
+    len_seg = round(1000 * (samples.shape[0] / frame_rate))
+
+    # 没有静音时整段都是非静音
+    if not silent_ranges:
+        return [[0, len_seg]]
+
+    # 整段都是静音
+    if silent_ranges[0][0] == 0 and silent_ranges[0][1] == len_seg:
+        return []
+
+    prev_end_i = 0
+    nonsilent_ranges = []
+    for start_i, end_i in silent_ranges:
+        nonsilent_ranges.append([prev_end_i, start_i])
+        prev_end_i = end_i
+
+    if end_i != len_seg:
+        nonsilent_ranges.append([prev_end_i, len_seg])
+
+    if nonsilent_ranges[0] == [0, 0]:
+        nonsilent_ranges.pop(0)
+
+    return nonsilent_ranges
+
+def apply_gain_ranges(samples, frame_rate, ranges, gain_db, ramp_ms=0):
+    """
+    只对指定区间施加增益，其余部分保持不变。通过一个逐帧增益掩码一次性完成，
+    取整与削波方式与 AudioSegment.apply_gain 一致。
+
+    参数:
+        samples (np.ndarray): 形状为 (帧数, 声道数) 的整数数组
+        frame_rate (int): 采样率
+        ranges (list): 需要增益的区间列表 [[开始, 结束], ...]（毫秒）
+        gain_db (int 或 float): 增益(dB)
+        ramp_ms (int 或 float): 区间边缘的渐变时长(毫秒)，用于避免爆音，默认为 0（不渐变）
+
+    返回值:
+        np.ndarray: 处理后的数组，形状与数据类型与输入相同
+    """
+    n_frames = samples.shape[0]
+    factor = 10 ** (float(gain_db) / 20)
+
+    # 毫秒 -> 帧，与 AudioSegment 切片的取整方式一致
+    ms_to_frames = frame_rate / 1000.0
+    bounds = (np.asarray(ranges, dtype=np.int64).reshape(-1, 2) * ms_to_frames).astype(np.int64)
+    bounds = np.minimum(bounds, n_frames)
+
+    # 区间标记的差分数组，前缀和大于 0 的帧位于增益区间内
+    delta = np.zeros(n_frames + 1, dtype=np.int32)
+    np.add.at(delta, bounds[:, 0], 1)
+    np.add.at(delta, bounds[:, 1], -1)
+    gain = np.where(np.cumsum(delta[:-1]) > 0, factor, 1.0)
+
+    # 区间边缘线性渐变
+    ramp_frames = int(ramp_ms * ms_to_frames)
+    if ramp_frames > 0:
+        for start, end in bounds:
+            length = min(ramp_frames, (end - start) // 2)
+            if length <= 0:
+                continue
+            ramp = np.linspace(1.0, factor, length, endpoint=False)
+            gain[start:start + length] = ramp
+            gain[end - length:end] = ramp[::-1]
+
+    info = np.iinfo(samples.dtype)
+    boosted = samples * gain[:, None]
+    np.clip(boosted, info.min, info.max, out=boosted)
+    np.floor(boosted, out=boosted)
+    return boosted.astype(samples.dtype)
+
+def trim_silence_array(samples, frame_rate, sample_width, silence_thresh=-40, keep_silence=200):
+    """
+    去掉音频首尾的静音部分，结果与 AudioSegment 按毫秒切片一致。
+
+    参数:
+        samples (np.ndarray): 形状为 (帧数, 声道数) 的整数数组
+        frame_rate (int): 采样率
+        sample_width (int): 采样宽度(字节)
+        silence_thresh (int): 静音阈值(dBFS)，默认-40dB
+        keep_silence (int): 音频前后保留的静音时长(毫秒)，默认200ms(0.2秒)
+
+    返回值:
+        np.ndarray 或 None: 裁剪后的数组；如果音频为全静音则返回 None
+    """
+    # 确保 keep_silence 是毫秒为单位
+    if isinstance(keep_silence, float):
+        keep_silence = int(keep_silence * 1000)  # 转换秒到毫秒
+
+    nonsilent_parts = detect_nonsilent_array(samples, frame_rate, sample_width, min_silence_len=50, silence_thresh=silence_thresh)
+    if not nonsilent_parts:
+        return None
+
+    # 计算裁剪范围（前后保留 keep_silence 毫秒）
+    length_ms = round(1000 * (samples.shape[0] / frame_rate))
+    start = max(0, nonsilent_parts[0][0] - keep_silence)
+    end = min(length_ms, nonsilent_parts[-1][1] + keep_silence)
+
+    # 毫秒 -> 帧；取整误差导致末尾不足时与 AudioSegment 一样补零
+    ms_to_frames = frame_rate / 1000.0
+    start_frame, end_frame = int(start * ms_to_frames), int(end * ms_to_frames)
+    trimmed = samples[start_frame:end_frame]
+    missing = (end_frame - start_frame) - trimmed.shape[0]
+    if missing > 0:
+        trimmed = np.concatenate((trimmed, np.zeros((missing, samples.shape[1]), dtype=samples.dtype)))
+    return trimmed
+
+def boost_nonsilent_array(samples, frame_rate, sample_width, volume_boost=2, silence_thresh=-40, ramp_ms=0):
+    """
+    提高音频非静音部分的音量，低于 silence_thresh 的静音部分保持不变。
+
+    参数:
+        samples (np.ndarray): 形状为 (帧数, 声道数) 的整数数组
+        frame_rate (int): 采样率
+        sample_width (int): 采样宽度(字节)
+        volume_boost (int 或 float): 提高音量的 dB 值，默认为 2 dB
+        silence_thresh (int): 静音阈值(dBFS)，默认-40dB
+        ramp_ms (int 或 float): 非静音区间边缘的渐变时长(毫秒)，默认为 0（不渐变）
+
+    返回值:
+        np.ndarray: 处理后的数组
+    """
+    nonsilent_parts = detect_nonsilent_array(samples, frame_rate, sample_width, min_silence_len=50, silence_thresh=silence_thresh)
+    return apply_gain_ranges(samples, frame_rate, nonsilent_parts, volume_boost, ramp_ms)
+
+def convert_array(samples, frame_rate, sample_width, target_frame_rate=None, target_channels=None, target_sample_width=None):
+    """
+    将音频转换为目标采样率、声道数与采样宽度。已符合目标格式的部分不做任何处理，
+    重采样使用多相滤波（scipy.signal.resample_poly），对整段音频一次完成。
+
+    参数:
+        samples (np.ndarray): 形状为 (帧数, 声道数) 的整数数组
+        frame_rate (int): 采样率
+        sample_width (int): 采样宽度(字节)
+        target_frame_rate (int): 目标采样率，默认为 None（保持原采样率）
+        target_channels (int): 目标声道数，默认为 None（保持原声道数）
+        target_sample_width (int): 目标采样宽度(字节)，1、2 或 4，默认为 None（保持原采样宽度）
+
+    返回值:
+        tuple: (转换后的数组, 采样率, 采样宽度)
+    """
+    target_frame_rate = target_frame_rate or frame_rate
+    target_channels = target_channels or samples.shape[1]
+    target_sample_width = target_sample_width or sample_width
+    if target_sample_width not in SAMPLE_DTYPES:
+        raise ValueError(f"不支持的采样宽度: {target_sample_width}")
+
+    resample = target_frame_rate != frame_rate
+    remix = target_channels != samples.shape[1]
+    if not resample and not remix:
+        if target_sample_width == sample_width:
+            return samples, frame_rate, sample_width
+        # 只改变位深时按整数移位转换（与 audioop.lin2lin 一致）
+        shift = 8 * (target_sample_width - sample_width)
+        wide = samples.astype(np.int64)
+        wide = wide << shift if shift > 0 else wide >> -shift
+        return wide.astype(SAMPLE_DTYPES[target_sample_width]), frame_rate, target_sample_width
+
+    # 归一化到 [-1, 1) 后再混音与重采样
+    data = samples.astype(np.float64) / (2 ** (8 * sample_width - 1))
+    if remix:
+        # 多声道先混为单声道，复制到目标声道数放在重采样之后，避免对相同的声道重复滤波
+        data = data.mean(axis=1, keepdims=True)
+    if resample:
+        from scipy.signal import resample_poly  # 只在需要重采样时导入
+        divisor = math.gcd(int(target_frame_rate), int(frame_rate))
+        data = resample_poly(data, target_frame_rate // divisor, frame_rate // divisor, axis=0)
+    if remix and target_channels > 1:
+        data = np.repeat(data, target_channels, axis=1)
+
+    full_scale = 2 ** (8 * target_sample_width - 1)
+    data = np.clip(np.round(data * full_scale), -full_scale, full_scale - 1)
+    return data.astype(SAMPLE_DTYPES[target_sample_width]), target_frame_rate, target_sample_width
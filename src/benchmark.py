@@ -0,0 +1,359 @@
+"""
+性能基准测试：生成合成语料与录音，在无界面环境下对各个热点阶段计时，
+并将耗时、峰值内存与吞吐量写入 JSON 文件，便于与之前的结果对比。
+
+用法（在项目根目录下运行）:
+    python -m src.benchmark --output benchmark.json
+    python -m src.benchmark --compare benchmark.json --output benchmark_new.json
+"""
+import os
+import sys
+import json
+import time
+import wave
+import shutil
+import argparse
+import platform
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+DEFAULT_SIZES = (600, 10000, 100000)
+SAMPLE_TYPES = {2: '<i2', 4: '<i4'}
+
+# 只依赖语料大小的阶段，对每个语料规模分别测试；其余阶段依赖录音，只使用最小的语料测试
+TEXT_STAGES = ('string_stats', 'coverage')
+
+def synthesize_corpus(n_sentences, seed=0):
+    """
+    生成合成语料：汉字按 Zipf 分布抽取，夹杂标点与中文数字。
+    相同 seed 下，较小语料是较大语料的前缀。
+
+    参数:
+        n_sentences (int): 句子数
+        seed (int): 随机种子，默认为 0
+
+    返回值:
+        dict: {句子编号: 句子文本}
+    """
+    rng = np.random.default_rng(seed)
+    hanzi = np.array([chr(code) for code in range(0x4e00, 0x9fa6)])
+    weights = 1.0 / np.arange(1, len(hanzi) + 1)
+    weights /= weights.sum()
+    digits = list("零一二三四五六七八九十百千万亿兆")
+    lengths = rng.integers(10, 41, size=n_sentences)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    all_chars = rng.choice(hanzi, size=int(offsets[-1]), p=weights)
+    sentences = {}
+    for i in range(n_sentences):
+        length = int(lengths[i])
+        chars = list(all_chars[offsets[i]:offsets[i + 1]])
+        if rng.random() < 0.2:
+            chars[int(rng.integers(0, length))] = digits[int(rng.integers(0, len(digits)))]
+        for pos in rng.integers(1, length, size=length // 12):
+            chars[pos] = '，'
+        sentences[f"s{i:06d}"] = ''.join(chars) + '。'
+    return sentences
+
+def synthesize_take(file_path, duration=4.0, sample_rate=48000, channels=1, sample_width=2, seed=0):
+    """
+    生成类语音的合成录音：前后留有静音，中间是若干段带谐波的音节，底噪约 -50dBFS。
+
+    参数:
+        file_path (str): 输出的 .wav 文件路径
+        duration (float): 时长(秒)，默认为 4 秒
+        sample_rate (int): 采样率，默认为 48000
+        channels (int): 声道数，默认为 1
+        sample_width (int): 采样宽度(字节)，2 或 4，默认为 2
+        seed (int): 随机种子，默认为 0
+    """
+    rng = np.random.default_rng(seed)
+    n = int(duration * sample_rate)
+    t = np.arange(n) / sample_rate
+    signal = rng.normal(0, 10 ** (-50 / 20), n)
+
+    # 语音部分：前后各留 0.5~1 秒静音，中间每 0.2~0.4 秒一个音节
+    position = rng.uniform(0.5, 1.0)
+    end = duration - rng.uniform(0.5, 1.0)
+    while position < end:
+        length = min(rng.uniform(0.15, 0.35), end - position)
+        start, stop = int(position * sample_rate), int((position + length) * sample_rate)
+        f0 = rng.uniform(120, 250)
+        syllable = sum(np.sin(2 * np.pi * f0 * k * t[start:stop]) / k for k in range(1, 6))
+        signal[start:stop] += rng.uniform(0.1, 0.4) * syllable * np.hanning(stop - start)
+        position += length + rng.uniform(0.05, 0.3)
+
+    info = np.iinfo(np.dtype(SAMPLE_TYPES[sample_width]))
+    pcm = (np.clip(signal, -1, 1) * info.max).astype(SAMPLE_TYPES[sample_width])
+    pcm = np.repeat(pcm[:, None], channels, axis=1)
+    with wave.open(file_path, 'wb') as f:
+        f.setnchannels(channels)
+        f.setsampwidth(sample_width)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+
+def make_workspace(workdir, sizes=DEFAULT_SIZES, n_takes=60, duration=4.0, sample_rate=48000, channels=1, sample_width=2, seed=0):
+    """
+    在 workdir 中生成各规模的语料（corpus_{规模}.json）与录音（wav/）。
+    录音对应最小语料的前 n_takes 句，时长在 duration 的 0.5~1.5 倍之间。
+    """
+    os.makedirs(os.path.join(workdir, 'wav'), exist_ok=True)
+    corpus = synthesize_corpus(max(sizes), seed)
+    keys = list(corpus)
+    for size in sizes:
+        subset = {key: corpus[key] for key in keys[:size]}
+        with open(os.path.join(workdir, f'corpus_{size}.json'), 'w', encoding='utf-8') as f:
+            json.dump(subset, f, ensure_ascii=False)
+
+    rng = np.random.default_rng(seed)
+    for i, key in enumerate(keys[:min(n_takes, min(sizes))]):
+        synthesize_take(
+            os.path.join(workdir, 'wav', f'{key}.wav'),
+            duration * rng.uniform(0.5, 1.5), sample_rate, channels, sample_width, seed + i,
+        )
+
+def load_corpus(workdir, size):
+    """读取 make_workspace 生成的语料"""
+    with open(os.path.join(workdir, f'corpus_{size}.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+def list_takes(workdir):
+    """返回录音文件名列表（已排序）"""
+    return sorted(f for f in os.listdir(os.path.join(workdir, 'wav')) if f.endswith('.wav'))
+
+def copy_takes(workdir, name):
+    """将录音复制到新目录，供会修改文件的阶段使用"""
+    target = os.path.join(workdir, name)
+    shutil.rmtree(target, ignore_errors=True)
+    shutil.copytree(os.path.join(workdir, 'wav'), target)
+    return target
+
+# 各阶段的准备函数：完成不计时的准备工作，返回 (计时的函数, 处理数量, 单位)
+
+def setup_string_stats(workdir, size):
+    from src.text import string_stats
+    text = ''.join(load_corpus(workdir, size).values())
+    return lambda: string_stats(text), size, 'sentences'
+
+def setup_coverage(workdir, size):
+    from src.coverage import select_sentences
+    sentences = load_corpus(workdir, size)
+    return lambda: select_sentences(sentences), size, 'sentences'
+
+def setup_remove_silence(workdir, size):
+    from src.output import remove_silence_from_audio_files
+    directory = copy_takes(workdir, 'bench_remove_silence')
+    return lambda: remove_silence_from_audio_files(directory), len(list_takes(workdir)), 'files'
+
+def setup_merge(workdir, size):
+    from src.output import merge_wav_files
+    directory = os.path.join(workdir, 'wav')
+    output_file = os.path.join(workdir, 'bench_merge.wav')
+    return lambda: merge_wav_files(directory, output_file, 9999999), len(list_takes(workdir)), 'files'
+
+def setup_normalize(workdir, size):
+    # 只计时格式转换本身（48 kHz 单声道 -> 44.1 kHz 双声道 32 位，覆盖重采样、声道与位深转换）
+    from src.audio import convert_array
+    from src.wavio import read_wav
+    takes = [read_wav(os.path.join(workdir, 'wav', f)) for f in list_takes(workdir)]
+    def run():
+        for samples, frame_rate, sample_width in takes:
+            convert_array(samples, frame_rate, sample_width, 44100, 2, 4)
+    return run, len(takes), 'files'
+
+def setup_quality(workdir, size):
+    # 不使用缓存，测量完整分析全部录音的耗时
+    from src.quality import analyze_takes
+    paths = [os.path.join(workdir, 'wav', f) for f in list_takes(workdir)]
+    return lambda: analyze_takes(paths, cache_path=None), len(paths), 'files'
+
+def setup_waveform(workdir, size):
+    # plot_waveform 中的计算部分（分析 + 按像素宽度降采样），不包括 Qt 绘制
+    from src.waveform import analyze_wav, decimate_envelope
+    paths = [os.path.join(workdir, 'wav', f) for f in list_takes(workdir)]
+    def run():
+        for path in paths:
+            decimate_envelope(analyze_wav(path), 1500)
+    return run, len(paths), 'files'
+
+def run_export(workdir, size, incremental):
+    from src.output import main
+    os.chdir(workdir)
+    return main(project_name='bench', json_file=f'corpus_{size}.json', wav_dir='wav', incremental=incremental)
+
+def setup_export(workdir, size):
+    shutil.rmtree(os.path.join(workdir, 'projects'), ignore_errors=True)
+    return lambda: run_export(workdir, size, False), len(list_takes(workdir)), 'files'
+
+def setup_export_incremental(workdir, size):
+    # 先完整导出一次，只对没有任何变化的再次导出计时
+    shutil.rmtree(os.path.join(workdir, 'projects'), ignore_errors=True)
+    run_export(workdir, size, True)
+    return lambda: run_export(workdir, size, True), len(list_takes(workdir)), 'files'
+
+STAGE_SETUPS = {
+    'string_stats': setup_string_stats,
+    'coverage': setup_coverage,
+    'remove_silence': setup_remove_silence,
+    'merge': setup_merge,
+    'normalize': setup_normalize,
+    'quality': setup_quality,
+    'waveform': setup_waveform,
+    'export': setup_export,
+    'export_incremental': setup_export_incremental,
+}
+
+def peak_rss_mb():
+    """当前进程的峰值常驻内存(MB)，不支持的平台（Windows）返回 None"""
+    # Linux 的 ru_maxrss 会继承 fork 前父进程的峰值，优先读取只统计本进程地址空间的 VmHWM
+    try:
+        with open('/proc/self/status', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+def measure_stage(stage, workdir, size):
+    """在当前进程中准备并执行一个阶段，返回计时结果"""
+    # 阶段的输出（进度信息等）不计入结果，丢弃以免刷屏
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull
+        try:
+            run, items, unit = STAGE_SETUPS[stage](workdir, size)
+            start = time.perf_counter()
+            cpu_start = time.process_time()
+            run()
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu_start
+        finally:
+            sys.stdout = stdout
+    return {
+        'stage': stage,
+        'size': size,
+        'wall_s': round(wall, 4),
+        'cpu_s': round(cpu, 4),
+        'peak_rss_mb': peak_rss_mb(),
+        'items': items,
+        'unit': unit,
+        'items_per_s': round(items / wall, 2) if wall > 0 else None,
+    }
+
+def run_stage(stage, workdir, size, repeat=1):
+    """
+    在独立的子进程中执行阶段（每次重复都使用新进程，使峰值内存只反映该阶段），
+    返回耗时最短的一次结果，峰值内存取各次的最大值。
+    """
+    results = []
+    for _ in range(repeat):
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(measure_stage, stage, workdir, size).result())
+    best = min(results, key=lambda r: r['wall_s'])
+    peaks = [r['peak_rss_mb'] for r in results if r['peak_rss_mb'] is not None]
+    best['peak_rss_mb'] = round(max(peaks), 1) if peaks else None
+    return best
+
+def run_benchmarks(workdir, sizes=DEFAULT_SIZES, stages=None, repeat=1):
+    """
+    执行全部阶段。
+
+    参数:
+        workdir (str): make_workspace 生成的目录
+        sizes (tuple): 语料规模
+        stages (list): 需要执行的阶段，默认为 None（全部）
+        repeat (int): 每个阶段重复次数，默认为 1
+
+    返回值:
+        list: 各阶段的计时结果
+    """
+    stages = stages or list(STAGE_SETUPS)
+    results = []
+    for stage in stages:
+        for size in (sizes if stage in TEXT_STAGES else (min(sizes),)):
+            result = run_stage(stage, workdir, size, repeat)
+            print(f"{stage:<20} size={size:<7} {result['wall_s']:>9.3f}s  "
+                  f"{result['items_per_s']} {result['unit']}/s  峰值内存: {result['peak_rss_mb']} MB")
+            results.append(result)
+    return results
+
+def compare_results(baseline, results):
+    """
+    与基准结果对比，打印每个阶段的耗时与峰值内存变化。
+
+    返回值:
+        list: 耗时比基准增加 20% 以上的 (阶段, 规模) 列表
+    """
+    previous = {(r['stage'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        old = previous.get((result['stage'], result['size']))
+        if old is None or not old['wall_s']:
+            continue
+        ratio = result['wall_s'] / old['wall_s']
+        rss = ""
+        if result['peak_rss_mb'] and old.get('peak_rss_mb'):
+            rss = f"，峰值内存 {old['peak_rss_mb']} -> {result['peak_rss_mb']} MB"
+        flag = " [变慢]" if ratio > 1.2 else ""
+        print(f"{result['stage']:<20} size={result['size']:<7} {old['wall_s']:.3f}s -> {result['wall_s']:.3f}s ({ratio:.2f}x){rss}{flag}")
+        if ratio > 1.2:
+            regressions.append((result['stage'], result['size']))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="zh-tts-mini-corpus 性能基准测试")
+    parser.add_argument('--output', default='benchmark.json', help="结果文件，默认为 benchmark.json")
+    parser.add_argument('--compare', help="与之前的结果文件对比")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="语料规模（句子数）")
+    parser.add_argument('--stages', nargs='+', choices=list(STAGE_SETUPS), help="只执行指定阶段")
+    parser.add_argument('--takes', type=int, default=60, help="合成录音数，默认为 60")
+    parser.add_argument('--duration', type=float, default=4.0, help="录音平均时长(秒)，默认为 4")
+    parser.add_argument('--sample-rate', type=int, default=48000, help="采样率，默认为 48000")
+    parser.add_argument('--channels', type=int, default=1, help="声道数，默认为 1")
+    parser.add_argument('--sample-width', type=int, choices=sorted(SAMPLE_TYPES), default=2, help="采样宽度(字节)，默认为 2")
+    parser.add_argument('--repeat', type=int, default=1, help="每个阶段重复次数（取最快的一次），默认为 1")
+    parser.add_argument('--seed', type=int, default=0, help="随机种子，默认为 0")
+    parser.add_argument('--workdir', help="工作目录（保留生成的数据），默认使用临时目录并在结束后删除")
+    args = parser.parse_args(argv)
+
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix='zh-tts-bench-')
+    try:
+        print(f"生成测试数据: {workdir}")
+        make_workspace(workdir, args.sizes, args.takes, args.duration, args.sample_rate,
+                       args.channels, args.sample_width, args.seed)
+        results = run_benchmarks(workdir, args.sizes, args.stages, args.repeat)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'cpu_count': os.cpu_count(),
+            'params': {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'workdir')},
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    print(f"结果已保存到 {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare_results(baseline, results):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+无界面的批量导出工具（不依赖 PyQt6），适用于服务器或构建机。
+
+用法（在项目根目录下运行）:
+    python -m src.cli -p 项目A wav -p 项目B other/wav --workers 4 --json
+"""
+import os
+import sys
+import json
+import argparse
+import contextlib
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="将录制好的音频导出为训练数据集（不启动界面）")
+    parser.add_argument('-p', '--project', nargs=2, action='append', metavar=('项目名称', '音频目录'),
+                        help="项目名称与对应的音频目录，可重复指定多个；默认为 default wav")
+    parser.add_argument('--corpus', default='corpus/zh_corpus_v1.json', help="语料文件，默认为 corpus/zh_corpus_v1.json")
+    parser.add_argument('--silence-thresh', type=float, default=-40, help="静音阈值(dBFS)，默认为 -40")
+    parser.add_argument('--keep-silence', type=int, default=500, help="音频前后保留的静音时长(毫秒)，默认为 500")
+    parser.add_argument('--volume-boost', type=float, default=0, help="提高音量的 dB 值，默认为 0")
+    parser.add_argument('--sample-rate', type=int, default=48000, help="输出音频的采样率，默认为 48000；0 表示保持原采样率")
+    parser.add_argument('--channels', type=int, default=1, help="输出音频的声道数，默认为 1；0 表示保持原声道数")
+    parser.add_argument('--bit-depth', type=int, choices=(0, 8, 16, 32), default=16, help="输出音频的位深，默认为 16；0 表示保持原位深")
+    parser.add_argument('--workers', type=int, default=1, help="音频处理进程数，默认为 1；0 表示使用 CPU 核心数")
+    parser.add_argument('--link-mode', choices=('hardlink', 'reflink', 'symlink', 'copy'), default='hardlink',
+                        help="CosyVoice 数据集中音频的物化方式，默认为 hardlink")
+    parser.add_argument('--exclude', nargs='+', choices=('削波', '音量过大', '音量过小', '底噪过高'), metavar='质量问题',
+                        help="排除存在这些质量问题的音频（削波、音量过大、音量过小、底噪过高），并在项目目录下生成质量报告")
+    parser.add_argument('--no-incremental', action='store_true', help="重新处理全部音频（忽略导出清单）")
+    parser.add_argument('--profile-stage', help="对指定阶段启用详细分析，如 处理音频")
+    parser.add_argument('--profile-tool', choices=('cprofile', 'tracemalloc'), default='cprofile', help="详细分析工具，默认为 cprofile")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出结果到标准输出（处理进度输出到标准错误）")
+    parser.add_argument('--output', help="将 JSON 结果保存到文件")
+    parser.add_argument('--char-freq', action='store_true', help="结果中包含字符频率（默认省略）")
+    parser.add_argument('--durations', action='store_true', help="结果中包含每句录音的时长（默认省略）")
+    return parser.parse_args(argv)
+
+def export_projects(jobs, char_freq=False, durations=False, **kwargs):
+    """
+    依次导出多个项目，单个项目失败不影响其他项目。
+
+    参数:
+        jobs (list): [(项目名称, 音频目录), ...]
+        char_freq (bool): 结果中是否保留字符频率，默认为 False
+        durations (bool): 结果中是否保留每句录音的时长，默认为 False
+        **kwargs: 传给 output.main 的其他参数
+
+    返回值:
+        list: 每个项目的结果 {'project', 'wav_dir', 'ok', 'info' 或 'error'}
+    """
+    # 导出依赖 pydub 与 NumPy，只在真正执行时导入
+    from src.output import main as export_main
+
+    results = []
+    for project_name, wav_dir in jobs:
+        result = {'project': project_name, 'wav_dir': wav_dir}
+        if not os.path.isdir(wav_dir):
+            print(f"[错误] 音频目录 {wav_dir} 不存在")
+            result.update(ok=False, error=f"音频目录 {wav_dir} 不存在")
+            results.append(result)
+            continue
+        try:
+            info = export_main(project_name=project_name, wav_dir=wav_dir, **kwargs)
+        except Exception as e:
+            print(f"[错误] 导出项目 {project_name} 失败: {e}")
+            result.update(ok=False, error=str(e))
+        else:
+            if not char_freq:
+                info.pop('字符频率', None)
+            if not durations:
+                info.pop('各句时长(秒)', None)
+            result.update(ok=True, info=info)
+        results.append(result)
+    return results
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = [tuple(job) for job in args.project] if args.project else [('default', 'wav')]
+    kwargs = {
+        'json_file': args.corpus,
+        'silence_thresh': args.silence_thresh,
+        'keep_silence': args.keep_silence,
+        'volume_boost': args.volume_boost,
+        'frame_rate': args.sample_rate or None,
+        'channels': args.channels or None,
+        'sample_width': args.bit_depth // 8 or None,
+        'workers': args.workers or None,
+        'link_mode': args.link_mode,
+        'incremental': not args.no_incremental,
+        'exclude_warnings': args.exclude,
+        'profile_stage': args.profile_stage,
+        'profile_tool': args.profile_tool,
+    }
+
+    # 输出 JSON 时，处理进度改为输出到标准错误，保证标准输出只有 JSON
+    redirect = contextlib.redirect_stdout(sys.stderr) if args.json else contextlib.nullcontext()
+    with redirect:
+        results = export_projects(jobs, args.char_freq, args.durations, **kwargs)
+
+    text = json.dumps(results, ensure_ascii=False, indent=4)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    if args.json:
+        print(text)
+    else:
+        for result in results:
+            status = f"完成（录音总时长 {result['info']['录音时长']['总时长']}）" if result['ok'] else f"失败（{result['error']}）"
+            print(f"{result['project']}: {status}")
+    return 0 if all(result['ok'] for result in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+import heapq
+import numpy as np
+from src.text import is_hanzi, CHINESE_DIGITS
+
+# 估算朗读速度(字/秒)，用于按时长预算选句
+CHARS_PER_SECOND = 4.5
+
+# 没有质量评分（未分析过）的录音的评分，相当于信噪比 20dB，低于质量较好的录音
+UNSCORED_TAKE_SCORE = 0.5
+
+def sentence_features(sentences):
+    """
+    将每个句子表示为其包含的不重复汉字编号（CSR 格式的稀疏数组）。
+
+    参数:
+        sentences (dict): {句子编号: 句子文本}
+
+    返回值:
+        tuple: (汉字列表, indptr, indices)，第 i 句包含的汉字编号为 indices[indptr[i]:indptr[i + 1]]
+    """
+    feature_ids = {}
+    hanzi_cache = {}
+    indices = []
+    indptr = [0]
+    for text in sentences.values():
+        for char in set(text):
+            hanzi = hanzi_cache.get(char)
+            if hanzi is None:
+                hanzi = hanzi_cache[char] = is_hanzi(char)
+            if hanzi:
+                indices.append(feature_ids.setdefault(char, len(feature_ids)))
+        indptr.append(len(indices))
+    return list(feature_ids), np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int32)
+
+def sentence_cost(text, budget_unit='chars'):
+    """
+    句子的录制成本。
+
+    参数:
+        text (str): 句子文本
+        budget_unit (str): 'chars'（字符数）或 'seconds'（估算朗读时长，秒）
+
+    返回值:
+        float: 成本
+    """
+    if budget_unit == 'seconds':
+        return len(text) / CHARS_PER_SECOND
+    if budget_unit == 'chars':
+        return float(len(text))
+    raise ValueError(f"不支持的预算单位: {budget_unit}")
+
+def select_sentences(sentences, budget=None, budget_unit='chars', digit_weight=1.0, costs=None, gain_weights=None):
+    """
+    在预算内按贪心策略选出覆盖最多不重复汉字（含中文数字）的句子，
+    每次选择“新增覆盖 / 成本”最大的句子。新增覆盖只会随已选句子增多而减少，
+    因此使用惰性贪心：只重新计算堆顶句子的收益。
+
+    参数:
+        sentences (dict): {句子编号: 句子文本}
+        budget (int 或 float): 预算，默认为 None（不限，直到覆盖全部汉字）
+        budget_unit (str): 预算单位，'chars'（字符数）或 'seconds'（估算朗读时长，秒），默认为 'chars'
+        digit_weight (float): 中文数字的权重（其他汉字为 1），默认为 1.0
+        costs (dict): {句子编号: 成本}，用于覆盖按文本估算的成本（如已录制音频的实际时长），默认为 None
+        gain_weights (dict): {句子编号: 收益系数}（如录音质量评分），缺省为 1，默认为 None
+
+    返回值:
+        dict: 包含以下键
+            - keys (list): 按选择顺序排列的句子编号
+            - cost (float): 已用预算
+            - covered (int): 覆盖的不重复汉字数
+            - total (int): 语料中的不重复汉字数
+    """
+    keys = list(sentences)
+    features, indptr, indices = sentence_features(sentences)
+    weights = np.ones(len(features), dtype=np.float64)
+    for i, char in enumerate(features):
+        if char in CHINESE_DIGITS:
+            weights[i] = digit_weight
+    if costs is None:
+        costs = [max(sentence_cost(sentences[key], budget_unit), 1e-9) for key in keys]
+    else:
+        costs = [max(float(costs[key]), 1e-9) for key in keys]
+    factors = np.ones(len(keys)) if gain_weights is None else np.array([gain_weights.get(key, 1.0) for key in keys], dtype=np.float64)
+    covered = np.zeros(len(features), dtype=bool)
+
+    # 堆中保存收益的上界（负数，最大堆），编号用于在收益相同时保持语料顺序
+    sentence_ids = np.repeat(np.arange(len(keys)), np.diff(indptr))
+    initial_gains = np.bincount(sentence_ids, weights=weights[indices], minlength=len(keys)) * factors
+    heap = [(-initial_gains[i] / costs[i], i) for i in range(len(keys)) if initial_gains[i] > 0]
+    heapq.heapify(heap)
+
+    remaining = float('inf') if budget is None else float(budget)
+    selected = []
+    used = 0.0
+    while heap:
+        _, i = heapq.heappop(heap)
+        if costs[i] > remaining:
+            continue  # 剩余预算只会减少，之后也放不下
+        ids = indices[indptr[i]:indptr[i + 1]]
+        new_ids = ids[~covered[ids]]
+        gain = float(weights[new_ids].sum()) * factors[i]
+        if gain <= 0:
+            continue
+        ratio = gain / costs[i]
+        if heap and ratio < -heap[0][0]:
+            heapq.heappush(heap, (-ratio, i))
+            continue
+        covered[new_ids] = True
+        selected.append(keys[i])
+        used += costs[i]
+        remaining -= costs[i]
+
+    return {
+        'keys': selected,
+        'cost': used,
+        'covered': int(np.count_nonzero(covered)),
+        'total': len(features),
+    }
+
+def coverage_order(sentences, budget=None, budget_unit='chars', digit_weight=1.0):
+    """
+    返回按覆盖率排序的句子编号：先是 select_sentences 选出的句子，
+    其余句子按原顺序排在后面。
+
+    参数:
+        与 select_sentences 相同
+
+    返回值:
+        list: 句子编号列表
+    """
+    selected = select_sentences(sentences, budget, budget_unit, digit_weight)['keys']
+    chosen = set(selected)
+    return selected + [key for key in sentences if key not in chosen]
+
+def fill_duration(durations, capacity, resolution=0.01):
+    """
+    子集和（0-1 背包）近似：在总时长不超过 capacity 的前提下，选出总时长尽可能接近 capacity 的一组音频。
+    时长按 resolution 向上取整后用布尔数组做动态规划，保证实际总时长不会超过 capacity。
+    排在前面的音频优先被使用。
+
+    参数:
+        durations (list): 各音频的时长(秒)
+        capacity (float): 时长上限(秒)
+        resolution (float): 时长精度(秒)，默认为 0.01
+
+    返回值:
+        list: 选中音频在 durations 中的序号
+    """
+    units = np.ceil(np.asarray(durations, dtype=np.float64) / resolution - 1e-9).astype(np.int64)
+    cap = int(np.floor(capacity / resolution + 1e-9))
+    if cap <= 0:
+        return []
+
+    # reachable[s]：总时长 s 可以达到；via[s]：首次达到 s 时加入的音频
+    reachable = np.zeros(cap + 1, dtype=bool)
+    reachable[0] = True
+    via = np.full(cap + 1, -1, dtype=np.int64)
+    for i, unit in enumerate(units):
+        if unit <= 0 or unit > cap:
+            continue
+        sums = np.flatnonzero(reachable[:cap + 1 - unit] & ~reachable[unit:]) + unit
+        reachable[sums] = True
+        via[sums] = i
+        if reachable[cap]:
+            break
+
+    # 从最大可达总时长回溯（via 中的音频只由更早的音频组合而来，不会重复使用）
+    picked = []
+    total = int(np.flatnonzero(reachable)[-1])
+    while total > 0:
+        picked.append(int(via[total]))
+        total -= units[via[total]]
+    return picked[::-1]
+
+def select_takes(sentences, durations, target, scores=None, digit_weight=1.0, resolution=0.01):
+    """
+    为固定时长的合并音频（如 2min.wav）选择录音：先按“新增汉字覆盖 × 质量评分 / 时长”
+    贪心排出发音多样、质量较好的录音，其余录音按质量评分排在后面，
+    再对全部录音做一次子集和动态规划（排在前面的录音优先），使总时长尽可能接近目标且不超过目标，
+    并且不短于按 durations 顺序依次填充的结果。
+
+    参数:
+        sentences (dict): {句子编号: 句子文本}，不在其中的录音视为没有文本
+        durations (dict): {句子编号: 录音时长(秒)}
+        target (float): 目标时长(秒)
+        scores (dict): {句子编号: 质量评分(0~1)}，评分为 0 的录音不会被选中，没有评分的录音按
+            UNSCORED_TAKE_SCORE 计，默认为 None（全部为 1）
+        digit_weight (float): 中文数字的权重，默认为 1.0
+        resolution (float): 时长精度(秒)，默认为 0.01
+
+    返回值:
+        dict: 包含以下键
+            - keys (list): 选中的句子编号（按 durations 中的顺序）
+            - duration (float): 选中录音的总时长(秒)
+            - covered (int): 选中录音覆盖的不重复汉字数
+    """
+    # 质量未知的录音排在质量较好的录音之后
+    default_score = 1.0 if scores is None else UNSCORED_TAKE_SCORE
+    scores = {key: (scores or {}).get(key, default_score) for key in durations}
+    candidates = {key: duration for key, duration in durations.items()
+                  if 0 < duration <= target and scores[key] > 0}
+    if not candidates:
+        return {'keys': [], 'duration': 0.0, 'covered': 0}
+
+    # 优先顺序：覆盖率贪心选出的录音在前，其余按质量评分从高到低
+    texts = {key: sentences.get(key, '') for key in candidates}
+    greedy = select_sentences(texts, target, digit_weight=digit_weight, costs=candidates, gain_weights=scores)['keys']
+    picked = set(greedy)
+    order = greedy + sorted((key for key in candidates if key not in picked), key=lambda key: -scores[key])
+
+    # 子集和动态规划在全部录音中求最接近目标的组合
+    chosen = {order[i] for i in fill_duration([candidates[key] for key in order], target, resolution)}
+
+    # 时长按精度向上取整会损失少量时长，因此与按原顺序依次填充（直到放不下为止）比较，保留总时长更长的结果
+    sequential = []
+    total = 0.0
+    for key, duration in candidates.items():
+        if total + duration > target:
+            break
+        sequential.append(key)
+        total += duration
+    if total > sum(candidates[key] for key in chosen):
+        chosen = set(sequential)
+
+    keys = [key for key in durations if key in chosen]
+    covered = {char for key in keys for char in texts[key] if is_hanzi(char)}
+    return {
+        'keys': keys,
+        'duration': sum(candidates[key] for key in keys),
+        'covered': len(covered),
+    }
@@ -0,0 +1,158 @@
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtMultimedia import QAudioFormat, QAudioSource
+from src.audio import LEVEL_BLOCK_SECONDS, noise_floor
+
+class RingBuffer:
+    """定长环形缓冲区，写满后覆盖最旧的数据"""
+
+    def __init__(self, capacity, dtype=np.float32):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._end = 0
+        self.total = 0  # 累计写入的元素数
+
+    def extend(self, values):
+        """追加数据"""
+        self.total += len(values)
+        values = values[-self.capacity:]
+        n = len(values)
+        first = min(n, self.capacity - self._end)
+        self._data[self._end:self._end + first] = values[:first]
+        self._data[:n - first] = values[first:]
+        self._end = (self._end + n) % self.capacity
+
+    def values(self):
+        """按时间顺序返回缓冲区中的数据（副本）"""
+        if self.total < self.capacity:
+            return self._data[:self._end].copy()
+        return np.concatenate((self._data[self._end:], self._data[:self._end]))
+
+    def clear(self):
+        """清空缓冲区"""
+        self._end = 0
+        self.total = 0
+
+class AudioLevelMonitor(QObject):
+    """
+    实时输入电平监测：直接从输入设备读取 PCM 数据（不经过磁盘），
+    按 10ms 块计算 dBFS 电平并保存到环形缓冲区。
+    """
+
+    # 当前电平(dBFS)、本次录制的最大音量(dB)、底噪(dB)、采样峰值(dBFS)
+    levels_updated = pyqtSignal(float, float, float, float)
+
+    def __init__(self, history_seconds=10, latency_ms=20, parent=None):
+        """
+        参数:
+            history_seconds (int 或 float): 波形图保留的历史时长(秒)，默认为 10 秒
+            latency_ms (int): 输入缓冲区时长(毫秒)，默认为 20ms
+            parent (QObject): 父对象
+        """
+        super().__init__(parent)
+        self.latency_ms = latency_ms
+        self.history = RingBuffer(int(history_seconds / LEVEL_BLOCK_SECONDS))
+        self.source = None
+        self.io_device = None
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.reset_stats()
+
+    def reset_stats(self):
+        """重置本次录制的统计信息"""
+        self.history.clear()
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.max_volume = -float('inf')
+        self.peak = -float('inf')
+
+    def start(self, device):
+        """
+        开始监测指定输入设备。
+
+        参数:
+            device (QAudioDevice): 音频输入设备
+        """
+        self.stop()
+        self.reset_stats()
+        audio_format = QAudioFormat()
+        audio_format.setSampleRate(48000)
+        audio_format.setChannelCount(1)
+        audio_format.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+        if not device.isFormatSupported(audio_format):
+            audio_format = device.preferredFormat()
+        self.audio_format = audio_format
+        self.block_size = max(1, int(audio_format.sampleRate() * LEVEL_BLOCK_SECONDS))
+
+        self.source = QAudioSource(device, audio_format, self)
+        self.source.setBufferSize(audio_format.bytesForDuration(self.latency_ms * 1000))
+        self.io_device = self.source.start()
+        if self.io_device is None:
+            print("[警告] 无法打开音频输入设备进行实时监测")
+            self.source = None
+            return
+        self.io_device.readyRead.connect(self._read_samples)
+
+    def stop(self):
+        """停止监测"""
+        if self.source is not None:
+            self.source.stop()
+            self.source.deleteLater()
+        self.source = None
+        self.io_device = None
+
+    def is_active(self):
+        """是否正在监测"""
+        return self.source is not None
+
+    def _to_float(self, raw):
+        """将原始 PCM 字节转换为 [-1, 1] 范围的单声道 float32 数组（取第一个声道）"""
+        sample_format = self.audio_format.sampleFormat()
+        if sample_format == QAudioFormat.SampleFormat.Int16:
+            samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768
+        elif sample_format == QAudioFormat.SampleFormat.Int32:
+            samples = np.frombuffer(raw, dtype=np.int32).astype(np.float32) / 2147483648
+        elif sample_format == QAudioFormat.SampleFormat.UInt8:
+            samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+        else:
+            samples = np.frombuffer(raw, dtype=np.float32)
+        channels = max(1, self.audio_format.channelCount())
+        samples = samples[:len(samples) - len(samples) % channels]
+        return samples[::channels]
+
+    def _read_samples(self):
+        """读取设备中的新数据并更新电平"""
+        if self.io_device is None:
+            return
+        raw = self.io_device.readAll().data()
+        if not raw:
+            return
+        samples = np.concatenate((self._pending, self._to_float(raw)))
+
+        # 按块计算 RMS 电平，不足一块的数据留到下次
+        n_blocks = len(samples) // self.block_size
+        self._pending = samples[n_blocks * self.block_size:]
+        if n_blocks == 0:
+            return
+        blocks = samples[:n_blocks * self.block_size].reshape(n_blocks, self.block_size)
+        rms = np.sqrt(np.mean(np.square(blocks), axis=1))
+        levels = 20 * np.log10(np.maximum(rms, 1e-10))
+        self.history.extend(levels)
+
+        self.peak = max(self.peak, float(20 * np.log10(max(float(np.max(np.abs(blocks))), 1e-10))))
+        self.max_volume = max(self.max_volume, float(np.max(levels)))
+        self.levels_updated.emit(float(levels[-1]), self.max_volume, self.noise_floor(), self.peak)
+
+    def noise_floor(self):
+        """以历史电平的第 10 百分位估计底噪"""
+        return noise_floor(self.history.values())
+
+    def envelope(self):
+        """
+        返回用于绘图的滚动包络。
+
+        返回值:
+            tuple: (时间轴(秒，从开始监测起算), dBFS)
+        """
+        levels = self.history.values()
+        first_block = self.history.total - len(levels)
+        times = (np.arange(len(levels)) + first_block) * LEVEL_BLOCK_SECONDS
+        return times, levels
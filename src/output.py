@@ -1,86 +1,84 @@
 import os
 import json
 import shutil
+import wave
+import struct
 from pathlib import Path
-from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
-import re
-from collections import Counter
-
-def merge_text_from_list(file_path):
-    """解析.list文件，合并成一个文本并返回"""
-    merged_text = ""
+from src.audio import audio_segment_to_array, trim_silence_array, boost_nonsilent_array, convert_array, TARGET_FRAME_RATE, TARGET_CHANNELS, TARGET_SAMPLE_WIDTH
+from src.wavio import read_wav, write_wav, read_wav_header, pcm_bytes, WavFormatError, WAVE_FORMAT_PCM
+from src.text import merge_text_from_list, string_stats, list_files_stats
+from src.profiling import StageProfiler, file_size
+from src.quality import analyze_takes, save_quality_report, quality_score
+from src.coverage import select_takes
+from src.takes import take_duration, duration_stats
+from src.tools import load_json_cache, save_json_cache
+from concurrent.futures import ProcessPoolExecutor
+
+class ExportCancelled(Exception):
+    """导出被用户取消"""
+
+def raise_if_cancelled(should_cancel):
+    """should_cancel() 返回 True 时抛出 ExportCancelled"""
+    if should_cancel is not None and should_cancel():
+        raise ExportCancelled("导出已取消")
+
+def report_progress(progress_callback, stage, current, total):
+    """调用进度回调 progress_callback(阶段名称, 已完成数, 总数)"""
+    if progress_callback is not None:
+        progress_callback(stage, current, total)
+
+def pydub_audio_segment():
+    """延迟导入 pydub，只在需要 ffmpeg 转码或格式转换时使用"""
+    from pydub import AudioSegment
+    # 设置 ffmpeg 路径（如果 ffmpeg.exe 在 src 目录，否则使用系统中的 ffmpeg）
+    converter = os.path.abspath("src/ffmpeg.exe")
+    if os.path.exists(converter):
+        AudioSegment.converter = converter
+    return AudioSegment
+
+def load_wav_samples(filepath):
+    """
+    读取音频文件为整数数组。PCM / 浮点 WAV 直接在进程内解析，
+    其他编码（如压缩格式）才调用 ffmpeg 转码。
+
+    参数:
+        filepath (str): 音频文件路径
+
+    返回值:
+        tuple: (形状为 (帧数, 声道数) 的整数数组, 采样率, 采样宽度(字节))
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                text = line.split('|')[-1]
-                if text:
-                    merged_text += text
-    except FileNotFoundError:
-        print(f"[错误] 文件 {file_path} 未找到")
-        return ""
-    except Exception as e:
-        print(f"[错误] 读取文件时出错: {e}")
-        return ""
-    return merged_text
+        return read_wav(filepath)
+    except WavFormatError:
+        audio = pydub_audio_segment().from_file(filepath)
+        return audio_segment_to_array(audio), audio.frame_rate, audio.sample_width
 
-def string_stats(text):
-    # 总字符数
-    total_chars = len(text)
-    
-    # 不重复字符数
-    unique_chars = len(set(text))
-    
-    # 字符频率统计（从多到少排列）
-    char_counter = Counter(text)
-    char_freq = dict(char_counter.most_common())
-    
-    # 汉字相关统计
-    # 匹配所有中文字符（包括基本汉字和扩展汉字区）
-    hanzi_chars = re.findall(r'[\u4e00-\u9fff\u3400-\u4dbf\U00020000-\U0002a6df\U0002a700-\U0002b73f\U0002b740-\U0002b81f\U0002b820-\U0002ceaf]', text)
-    total_hanzi = len(hanzi_chars)
-    unique_hanzi = len(set(hanzi_chars))
-    hanzi_coverage = unique_hanzi / 21886 # GBK收录21886个汉字，含简体、繁体及部分异体字
-    
-    # 中文数字覆盖率
-    chinese_digits = "零一二三四五六七八九十百千万亿兆"
-    found_digits = [c for c in hanzi_chars if c in chinese_digits]
-    unique_found_digits = len(set(found_digits))
-    digit_coverage = unique_found_digits / len(chinese_digits) if len(chinese_digits) > 0 else 0.0
-    
-    # 其他统计信息
-    # 统计空格数
-    space_count = text.count(' ')
-    
-    # 统计数字数（阿拉伯数字）
-    digit_count = sum(c.isdigit() for c in text)
-    
-    # 统计标点符号数（简单统计常见中英文标点）
-    punctuation = re.findall(r'[，。！？、；："\'‘’“”《》【】（）〔〕…—~`!@#$%^&*()_+\-=\[\]{};:\\|,.<>/?]', text)
-    punctuation_count = len(punctuation)
-    
-    # 统计字母数
-    letter_count = sum(c.isalpha() for c in text if not re.match(r'[\u4e00-\u9fff\u3400-\u4dbf\U00020000-\U0002a6df\U0002a700-\U0002b73f\U0002b740-\U0002b81f\U0002b820-\U0002ceaf]', c))
-    
-    # 构建结果字典
-    result = {
-        '总字符数': total_chars,
-        '不重复字符数': unique_chars,
-        '字符频率': char_freq,
-        '总汉字数': total_hanzi,
-        '不重复汉字数': unique_hanzi,
-        'GBK汉字覆盖率': f"{round(hanzi_coverage, 4) * 100}%",
-        '中文数字覆盖率': f"{round(digit_coverage, 4) * 100}%",
-        '空格数': space_count,
-        '阿拉伯数字数': digit_count,
-        '字母数': letter_count,
-        '标点符号数': punctuation_count,
-    }
-    
-    return result
+def increase_audio_file_volume(filepath, volume_boost=2, silence_thresh=-40):
+    """
+    提高单个 .wav 文件的音频音量，但不增强低于 silence_thresh 的静音部分，结果覆盖原文件。
+
+    参数:
+        filepath (str): .wav 文件路径
+        volume_boost (int 或 float): 提高音量的 dB 值，默认为 2 dB
+        silence_thresh (int): 静音阈值(dBFS)，默认-40dB，低于此值的部分不会被增强
+
+    返回值:
+        bool: 处理成功返回 True，出错返回 False
+    """
+    filename = os.path.basename(filepath)
+
+    try:
+        # 加载音频文件
+        samples, frame_rate, sample_width = load_wav_samples(filepath)
+
+        # 导出并覆盖原文件
+        write_wav(filepath, boost_nonsilent_array(samples, frame_rate, sample_width, volume_boost, silence_thresh), frame_rate)
+        print(f"音量提升成功: {filename}")
+        return True
+
+    except Exception as e:
+        print(f"处理 {filename} 时出错: {str(e)}")
+        return False
 
 def increase_audio_volume(directory, volume_boost=2, silence_thresh=-40):
     """
@@ -91,52 +89,43 @@ def increase_audio_volume(directory, volume_boost=2, silence_thresh=-40):
         volume_boost (int 或 float): 提高音量的 dB 值，默认为 2 dB
         silence_thresh (int): 静音阈值(dBFS)，默认-40dB，低于此值的部分不会被增强
     """
-    # 设置 ffmpeg 路径（如果 ffmpeg.exe 在当前目录）
-    AudioSegment.converter = os.path.abspath("src/ffmpeg.exe")
-
     # 遍历目录下的所有文件
     for filename in os.listdir(directory):
         if filename.lower().endswith('.wav'):
             filepath = os.path.join(directory, filename)
+            increase_audio_file_volume(filepath, volume_boost=volume_boost, silence_thresh=silence_thresh)
 
-            try:
-                # 加载音频文件
-                audio = AudioSegment.from_wav(filepath)
-
-                # 检测非静音部分
-                nonsilent_parts = detect_nonsilent(
-                    audio,
-                    min_silence_len=50,
-                    silence_thresh=silence_thresh,
-                )
-
-                # 创建一个新的空音频段用于拼接
-                boosted_audio = AudioSegment.silent(duration=0)
-
-                # 上一个片段的结束位置
-                prev_end = 0
+def remove_silence_from_audio_file(filepath, silence_thresh=-40, keep_silence=200):
+    """
+    去掉单个 .wav 文件收尾的静音部分，然后以原文件名保存。
 
-                # 只对非静音部分进行音量增强
-                for start, end in nonsilent_parts:
-                    # 添加当前静音部分（从上一个片段结束到当前片段开始）
-                    silent_segment = audio[prev_end:start]
-                    boosted_audio += silent_segment
+    参数:
+        filepath (str): .wav 文件路径
+        silence_thresh (int): 静音阈值(dBFS)，默认-40dB
+        keep_silence (int): 音频前后保留的静音时长(毫秒)，默认200ms(0.2秒)
 
-                    # 增强当前非静音部分的音量
-                    nonsilent_segment = audio[start:end] + volume_boost
-                    boosted_audio += nonsilent_segment
+    返回值:
+        bool: 处理成功返回 True，全静音或出错返回 False
+    """
+    filename = os.path.basename(filepath)
 
-                    prev_end = end
+    try:
+        # 加载音频文件
+        samples, frame_rate, sample_width = load_wav_samples(filepath)
 
-                # 添加最后一段静音之后的部分
-                boosted_audio += audio[prev_end:]
+        processed_samples = trim_silence_array(samples, frame_rate, sample_width, silence_thresh, keep_silence)
+        if processed_samples is None:
+            print(f"警告: {filename} 可能是全静音，跳过处理")
+            return False
 
-                # 导出并覆盖原文件
-                boosted_audio.export(filepath, format="wav")
-                print(f"音量提升成功: {filename}")
+        # 裁剪并保存
+        write_wav(filepath, processed_samples, frame_rate)
+        print(f"首尾静音去除成功: {filename}")
+        return True
 
-            except Exception as e:
-                print(f"处理 {filename} 时出错: {str(e)}")
+    except Exception as e:
+        print(f"处理 {filename} 时出错: {str(e)}")
+        return False
 
 def remove_silence_from_audio_files(directory, silence_thresh=-40, keep_silence=200):
     """
@@ -147,44 +136,11 @@ def remove_silence_from_audio_files(directory, silence_thresh=-40, keep_silence=
         silence_thresh (int): 静音阈值(dBFS)，默认-40dB
         keep_silence (int): 音频前后保留的静音时长(毫秒)，默认200ms(0.2秒)
     """
-    # 设置 ffmpeg 路径（如果 ffmpeg.exe 在当前目录）
-    AudioSegment.converter = os.path.abspath("src/ffmpeg.exe")
-    
-    # 确保 keep_silence 是毫秒为单位
-    if isinstance(keep_silence, float):
-        keep_silence = int(keep_silence * 1000)  # 转换秒到毫秒
-    
     # 遍历目录下的所有文件
     for filename in os.listdir(directory):
         if filename.lower().endswith('.wav'):
             filepath = os.path.join(directory, filename)
-            
-            try:
-                # 加载音频文件
-                audio = AudioSegment.from_wav(filepath)
-                
-                # 检测非静音部分
-                nonsilent_parts = detect_nonsilent(
-                    audio,
-                    min_silence_len=50,
-                    silence_thresh=silence_thresh,
-                )
-                
-                if not nonsilent_parts:
-                    print(f"警告: {filename} 可能是全静音，跳过处理")
-                    continue
-                
-                # 计算裁剪范围（前后保留 keep_silence 毫秒）
-                start = max(0, nonsilent_parts[0][0] - keep_silence)
-                end = min(len(audio), nonsilent_parts[-1][1] + keep_silence)
-                
-                # 裁剪并保存
-                processed_audio = audio[start:end]
-                processed_audio.export(filepath, format="wav")
-                print(f"首尾静音去除成功: {filename}")
-                
-            except Exception as e:
-                print(f"处理 {filename} 时出错: {str(e)}")
+            remove_silence_from_audio_file(filepath, silence_thresh=silence_thresh, keep_silence=keep_silence)
 
 def save_string_to_file(content, file_path, overwrite=True):
     """将字符串保存为文本文件，可选是否覆盖，并确保父目录存在"""
@@ -202,6 +158,55 @@ def copy_file(src, dst, overwrite=True):
     shutil.copy2(src, dst)
     return True
 
+LINK_MODES = ('hardlink', 'reflink', 'symlink', 'copy')
+
+def reflink_file(src, dst):
+    """使用写时复制（reflink）克隆文件，仅在支持 FICLONE 的 Linux 文件系统（btrfs、xfs 等）上可用"""
+    import fcntl
+    FICLONE = 0x40049409
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    shutil.copystat(src, dst)
+
+def link_file(src, dst, mode='hardlink', overwrite=True):
+    """
+    将文件src物化到dst，可选硬链接、reflink、符号链接或复制。
+    当前平台或文件系统不支持所选方式时，自动退回为复制。
+
+    参数:
+        src (str): 源文件路径
+        dst (str): 目标文件路径
+        mode (str): 'hardlink'、'reflink'、'symlink' 或 'copy'，默认为 'hardlink'
+        overwrite (bool): 是否覆盖已存在的文件，默认为 True
+
+    返回值:
+        bool: 成功返回 True，目标已存在且不覆盖时返回 False
+    """
+    if mode not in LINK_MODES:
+        raise ValueError(f"不支持的物化方式: {mode}")
+    dst_path = Path(dst)
+    if dst_path.exists() or dst_path.is_symlink():
+        if not overwrite:
+            return False
+        # 先删除旧文件，避免写入与其他目录共享的硬链接
+        dst_path.unlink()
+    dst_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if mode == 'hardlink':
+            os.link(src, dst)
+            return True
+        if mode == 'reflink':
+            reflink_file(src, dst)
+            return True
+        if mode == 'symlink':
+            os.symlink(os.path.relpath(src, dst_path.parent), dst)
+            return True
+    except (OSError, ImportError):
+        # 跨设备、权限不足或文件系统不支持时退回为复制
+        dst_path.unlink(missing_ok=True)
+    shutil.copy2(src, dst)
+    return True
+
 def read_json(file_path):
     """读取JSON文件为字典"""
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -217,6 +222,135 @@ def find_wav_files(directory):
     return [f for _, _, files in os.walk(directory) 
             for f in files if f.lower().endswith('.wav')]
 
+def read_wav_chunks(filepath, params=None, chunk_frames=65536):
+    """
+    按块读取 .wav 文件的 PCM 数据。文件格式与 params 不一致（或不是整数 PCM）时，
+    解码后转换为 params 指定的格式。
+
+    参数:
+        filepath (str): .wav 文件路径
+        params (tuple): 目标格式 (声道数, 采样宽度(字节), 采样率)，默认为 None（保持原格式）
+        chunk_frames (int): 每块读取的帧数，默认为 65536
+
+    返回值:
+        tuple: (格式, 总帧数, PCM 数据块迭代器)
+    """
+    try:
+        header = read_wav_header(filepath)
+    except (WavFormatError, OSError, struct.error):
+        header = None
+
+    # 整数 PCM 且格式一致时直接按块复制原始数据
+    if header is not None and header['format'] == WAVE_FORMAT_PCM:
+        file_params = (header['channels'], header['sample_width'], header['frame_rate'])
+        if params is None or file_params == params:
+            chunk_bytes = chunk_frames * header['channels'] * header['sample_width']
+            def chunks():
+                with open(filepath, 'rb') as f:
+                    f.seek(header['data_offset'])
+                    remaining = header['n_frames'] * header['channels'] * header['sample_width']
+                    while remaining > 0:
+                        data = f.read(min(chunk_bytes, remaining))
+                        if not data:
+                            break
+                        remaining -= len(data)
+                        yield data
+            return file_params, header['n_frames'], chunks()
+
+    # 格式不一致时转换为目标格式（24 位数据在内存中以 32 位整数存放）
+    samples, frame_rate, sample_width = load_wav_samples(filepath)
+    if params is None:
+        file_params = (samples.shape[1], sample_width, frame_rate)
+    else:
+        nchannels, sampwidth, framerate = params
+        samples, frame_rate, _ = convert_array(samples, frame_rate, sample_width, framerate, nchannels, 4 if sampwidth == 3 else sampwidth)
+        file_params = params
+    return file_params, samples.shape[0], iter([pcm_bytes(samples, file_params[1])])
+
+def merge_wav_files_streaming(directory, targets, progress_callback=None, should_cancel=None, selections=None):
+    """
+    遍历指定目录下的所有 .wav 文件，一次遍历同时生成多个合并文件。
+    PCM 数据直接追加写入输出文件，文件头在关闭时回填，内存占用与总时长无关。
+    所有音频统一为第一个文件的格式。合并过程写入临时文件，完成后才替换输出文件。
+
+    参数:
+        directory (str): 包含 .wav 文件的目录路径
+        targets (dict): {输出文件路径: 最大音频时长(秒)}，某个输出达到最大时长后停止向其追加
+        progress_callback (callable): 进度回调 progress_callback(阶段名称, 已完成数, 总数)，默认为 None
+        should_cancel (callable): 返回 True 时取消合并并抛出 ExportCancelled，默认为 None
+        selections (dict): {输出文件路径: 文件名集合}，指定后该输出只合并其中的文件，
+            没有被任何输出选中的文件不会被读取，默认为 None（合并全部文件）
+    """
+    selections = selections or {}
+    outputs = [{'path': path, 'max_duration': max_duration, 'selection': selections.get(path), 'writer': None, 'frames': 0, 'done': False}
+               for path, max_duration in targets.items()]
+    params = None
+
+    def open_writers(params):
+        for output in outputs:
+            Path(output['path']).parent.mkdir(parents=True, exist_ok=True)
+            writer = wave.open(f"{output['path']}.part", 'wb')
+            writer.setnchannels(params[0])
+            writer.setsampwidth(params[1])
+            writer.setframerate(params[2])
+            output['writer'] = writer
+
+    def discard_writers():
+        for output in outputs:
+            if output['writer'] is not None:
+                output['writer'].close()
+                os.remove(f"{output['path']}.part")
+
+    # 遍历目录下的所有文件
+    filenames = [filename for filename in os.listdir(directory) if filename.lower().endswith('.wav')]
+    for i, filename in enumerate(filenames, 1):
+        if all(output['done'] for output in outputs):
+            break
+        if should_cancel is not None and should_cancel():
+            discard_writers()
+            raise_if_cancelled(should_cancel)
+        report_progress(progress_callback, "合并音频", i, len(filenames))
+        if all(output['done'] or (output['selection'] is not None and filename not in output['selection']) for output in outputs):
+            continue
+        filepath = os.path.join(directory, filename)
+        try:
+            file_params, nframes, chunks = read_wav_chunks(filepath, params)
+            if params is None:
+                params = file_params
+                open_writers(params)
+
+            # 检查各输出文件是否超过最大时长
+            active = []
+            for output in outputs:
+                if output['done'] or (output['selection'] is not None and filename not in output['selection']):
+                    continue
+                if output['frames'] + nframes > output['max_duration'] * params[2]:
+                    print(f"警告: {output['path']} 已达到最大时长 {output['max_duration']} 秒，停止合并")
+                    output['done'] = True
+                    continue
+                active.append(output)
+
+            # 合并音频
+            for data in chunks:
+                for output in active:
+                    output['writer'].writeframesraw(data)
+            for output in active:
+                output['frames'] += nframes
+            if active:
+                print(f"已合并: {filename}")
+        except Exception as e:
+            print(f"处理 {filename} 时出错: {str(e)}")
+
+    # 没有可合并的音频时输出空文件（参数与 AudioSegment.silent 默认值一致）
+    if params is None:
+        open_writers((1, 2, 11025))
+
+    # 关闭文件时回填 RIFF 文件头
+    for output in outputs:
+        output['writer'].close()
+        os.replace(f"{output['path']}.part", output['path'])
+        print(f"所有音频已合并并保存至: {output['path']}")
+
 def merge_wav_files(directory, output_file, max_duration=9999999):
     """
     遍历指定目录下的所有 .wav 文件，并将其合并为一个 .wav 文件并导出，支持设置最大音频时长。
@@ -226,39 +360,186 @@ def merge_wav_files(directory, output_file, max_duration=9999999):
         output_file (str): 合并后的输出文件路径（包含文件名）
         max_duration (int 或 float): 最大音频时长(秒)，默认为 9999999 秒
     """
-    # 创建一个空音频段用于拼接
-    combined_audio = AudioSegment.silent(duration=0)
+    merge_wav_files_streaming(directory, {output_file: max_duration})
 
-    # 转换最大时长为毫秒（AudioSegment 使用毫秒作为时间单位）
-    max_duration_ms = max_duration * 1000
+def process_wav_file(src, dst, silence_thresh=-40, keep_silence=500, volume_boost=0, target_format=None):
+    """
+    单个音频文件的融合处理流程：只解码一次，在内存中去除首尾静音、调高音量、
+    转换为目标格式，最后只写出一次结果。该函数位于模块顶层，可被子进程调用。
 
-    # 遍历目录下的所有文件
-    for filename in os.listdir(directory):
-        if filename.lower().endswith('.wav'):
-            filepath = os.path.join(directory, filename)
-            try:
-                # 加载音频文件
-                audio = AudioSegment.from_wav(filepath)
+    参数:
+        src (str): 原始 .wav 文件路径
+        dst (str): 处理后的 .wav 文件路径
+        silence_thresh (int): 静音阈值(dBFS)，默认-40dB
+        keep_silence (int): 音频前后保留的静音时长(毫秒)，默认500ms
+        volume_boost (int 或 float): 提高音量的 dB 值，默认为 0 dB
+        target_format (tuple): 目标格式 (采样率, 声道数, 采样宽度(字节))，其中为 None 的项保持原样，
+            默认为 None（不转换格式）
+
+    返回值:
+        str: 处理后的 .wav 文件路径
+    """
+    filename = os.path.basename(src)
+
+    try:
+        # 删除上次导出的文件，避免写入与其他目录共享的硬链接
+        Path(dst).unlink(missing_ok=True)
 
-                # 检查当前合并后的音频是否超过最大时长
-                if len(combined_audio) + len(audio) > max_duration_ms:
-                    print(f"警告: 已达到最大时长 {max_duration} 秒，停止合并")
-                    break
+        samples, frame_rate, sample_width = load_wav_samples(src)
 
-                # 合并音频
-                combined_audio += audio
-                print(f"已合并: {filename}")
-            except Exception as e:
-                print(f"处理 {filename} 时出错: {str(e)}")
+        # 删除音频前后空白
+        trimmed_samples = trim_silence_array(samples, frame_rate, sample_width, silence_thresh, keep_silence)
+        if trimmed_samples is None:
+            print(f"警告: {filename} 可能是全静音，跳过裁剪")
+        else:
+            samples = trimmed_samples
 
-    # 确保输出目录存在
-    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        # 调高音频音量
+        if volume_boost > 0:
+            samples = boost_nonsilent_array(samples, frame_rate, sample_width, volume_boost)
 
-    # 导出合并后的音频文件
-    combined_audio.export(output_file, format="wav")
-    print(f"所有音频已合并并保存至: {output_file}")
+        # 转换为目标格式（裁剪后再重采样，减少计算量；已符合目标格式时不做处理）
+        if target_format is not None:
+            samples, frame_rate, sample_width = convert_array(samples, frame_rate, sample_width, *target_format)
 
-def main(project_name='default', json_file='corpus/zh_corpus_v1.json', wav_dir='wav', silence_thresh=-40, keep_silence=500, volume_boost=0):
+        Path(dst).parent.mkdir(parents=True, exist_ok=True)
+        write_wav(dst, samples, frame_rate)
+    except Exception as e:
+        # 处理失败时保留原始音频，保证数据集完整
+        print(f"处理 {filename} 时出错: {str(e)}")
+        copy_file(src, dst)
+    return dst
+
+def iter_processed_wav_files(tasks, silence_thresh=-40, keep_silence=500, volume_boost=0, workers=1, target_format=None):
+    """
+    逐个处理音频文件，并按输入顺序逐个返回结果。
+
+    参数:
+        tasks (list): (原始路径, 输出路径) 元组列表
+        silence_thresh (int): 静音阈值(dBFS)，默认-40dB
+        keep_silence (int): 音频前后保留的静音时长(毫秒)，默认500ms
+        volume_boost (int 或 float): 提高音量的 dB 值，默认为 0 dB
+        workers (int): 进程数，默认为 1（串行处理）；大于 1 或为 None（使用 CPU 核心数）时使用进程池
+        target_format (tuple): 目标格式 (采样率, 声道数, 采样宽度(字节))，默认为 None（不转换格式）
+
+    返回值:
+        generator: 依次产出 (原始路径, 输出路径)
+    """
+    if not tasks:
+        return
+    if workers is not None and workers <= 1:
+        for src, dst in tasks:
+            yield src, process_wav_file(src, dst, silence_thresh, keep_silence, volume_boost, target_format)
+        return
+    srcs = [src for src, _ in tasks]
+    dsts = [dst for _, dst in tasks]
+    n = len(tasks)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            # map 保证结果顺序与输入一致
+            yield from zip(srcs, executor.map(
+                process_wav_file, srcs, dsts,
+                [silence_thresh] * n, [keep_silence] * n, [volume_boost] * n, [target_format] * n,
+                chunksize=max(1, n // (4 * (workers or os.cpu_count() or 1))),
+            ))
+        finally:
+            # 提前停止迭代（如取消导出）时，丢弃尚未开始的任务
+            executor.shutdown(wait=True, cancel_futures=True)
+
+def take_signature(wav_path, params):
+    """
+    生成音频的导出签名：源文件大小、修改时间和处理参数，任一变化都需要重新处理。
+
+    参数:
+        wav_path (str): 原始 .wav 文件路径
+        params (dict): 处理参数
+
+    返回值:
+        dict: 导出签名
+    """
+    stat = os.stat(wav_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'params': params}
+
+def is_same_file_state(src, dst):
+    """判断dst是否与src为同一文件，或大小与修改时间均一致（视为已是最新副本）"""
+    try:
+        if os.path.samefile(src, dst):
+            return True
+        src_stat, dst_stat = os.stat(src), os.stat(dst)
+    except OSError:
+        return False
+    return src_stat.st_size == dst_stat.st_size and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+
+def remove_files_except(directory, keep):
+    """
+    删除目录下文件名不在 keep 中的文件（不递归）。
+
+    参数:
+        directory (str): 目录路径
+        keep (set): 需要保留的文件名集合
+
+    返回值:
+        int: 删除的文件数
+    """
+    if not os.path.isdir(directory):
+        return 0
+    removed = 0
+    for filename in os.listdir(directory):
+        file_path = os.path.join(directory, filename)
+        if filename not in keep and (os.path.isfile(file_path) or os.path.islink(file_path)):
+            os.remove(file_path)
+            print(f"已删除过期文件: {file_path}")
+            removed += 1
+    return removed
+
+def add_cosyvoice_item(wav_path, directory, wav_name, text, link_mode='hardlink'):
+    """
+    将一条音频及其文本写入 CosyVoice 数据集目录，音频只在内容变化或缺失时重新链接。
+
+    参数:
+        wav_path (str): 处理后的 .wav 文件路径
+        directory (str): 数据集目录
+        wav_name (str): 文件名（不含扩展名）
+        text (str): 句子文本
+        link_mode (str): 音频的物化方式，默认为 'hardlink'
+
+    返回值:
+        int: 实际写入的字节数（链接不计）
+    """
+    written = 0
+    copy_path = f"{directory}/{wav_name}.wav"
+    if link_file(wav_path, copy_path, link_mode, not is_same_file_state(wav_path, copy_path)):
+        stat = os.lstat(copy_path)
+        if stat.st_nlink == 1 and not os.path.islink(copy_path):
+            written += stat.st_size
+    text_path = f"{directory}/{wav_name}.normalized.txt"
+    save_string_to_file(text, text_path)
+    return written + len(text.encode('utf-8'))
+
+def select_clip_takes(directory, wav_files, sentences, max_duration, metrics=None):
+    """
+    为固定时长的合并音频（如 2min.wav）选择录音：时长只读取文件头，
+    结合录音质量评分与汉字覆盖，使总时长尽可能接近 max_duration。
+
+    参数:
+        directory (str): 处理后的音频目录
+        wav_files (list): 音频文件名列表
+        sentences (dict): {句子编号: 句子文本}
+        max_duration (int 或 float): 目标时长(秒)
+        metrics (dict): {文件名: analyze_take 的返回值}，不在其中的录音按中等质量计，默认为 None（不考虑质量）
+
+    返回值:
+        set: 选中的文件名集合
+    """
+    durations = {wav_file.split('.wav')[0]: take_duration(f"{directory}/{wav_file}") for wav_file in wav_files}
+    scores = None
+    if metrics is not None:
+        scores = {wav_file.split('.wav')[0]: quality_score(metrics[wav_file]) for wav_file in wav_files if wav_file in metrics}
+    selection = select_takes(sentences, durations, max_duration, scores)
+    print(f"选用 {len(selection['keys'])} 个音频，共 {selection['duration']:.2f} 秒，覆盖 {selection['covered']} 个汉字")
+    return {f"{key}.wav" for key in selection['keys']}
+
+def main(project_name='default', json_file='corpus/zh_corpus_v1.json', wav_dir='wav', silence_thresh=-40, keep_silence=500, volume_boost=0, frame_rate=TARGET_FRAME_RATE, channels=TARGET_CHANNELS, sample_width=TARGET_SAMPLE_WIDTH, workers=1, link_mode='hardlink', incremental=True, exclude_warnings=None, progress_callback=None, should_cancel=None, profile_stage=None, profile_tool='cprofile'):
     """
     主流程函数，用于整理音频文件、生成列表并处理音频。
     
@@ -269,46 +550,146 @@ def main(project_name='default', json_file='corpus/zh_corpus_v1.json', wav_dir='
         silence_thresh (int): 静音阈值(dBFS)，默认-40dB
         keep_silence (int): 音频前后保留的静音时长(毫秒)，默认500ms
         volume_boost (int 或 float): 提高音量的 dB 值，默认为 0 dB
+        frame_rate (int): 输出音频的采样率，默认为 48000；为 None 时保持原采样率
+        channels (int): 输出音频的声道数，默认为 1；为 None 时保持原声道数
+        sample_width (int): 输出音频的采样宽度(字节)，1、2 或 4，默认为 2（16bit）；为 None 时保持原采样宽度
+        workers (int): 音频处理进程数，默认为 1（串行处理）；为 None 时使用 CPU 核心数
+        link_mode (str): CosyVoice 数据集中音频的物化方式（'hardlink'、'reflink'、'symlink' 或 'copy'），默认为 'hardlink'
+        incremental (bool): 是否增量导出（只处理新增或修改过的音频），默认为 True
+        exclude_warnings (list): 需要排除的质量问题（check_level_targets 的提示，如 ['削波', '底噪过高']），
+            存在其中任一问题的音频不会放入数据集，质量报告保存为项目目录下的 quality_report.csv，
+            默认为 None（不检查质量）
+        progress_callback (callable): 进度回调 progress_callback(阶段名称, 已完成数, 总数)，默认为 None
+        should_cancel (callable): 返回 True 时在当前文件处理完后停止导出并抛出 ExportCancelled，
+            已处理的结果会记录在导出清单中，下次导出时继续，默认为 None
+        profile_stage (str): 需要详细分析的阶段（如 '处理音频'），默认为 None（不分析）
+        profile_tool (str): 详细分析工具，'cprofile'（结果保存为项目目录下的 export_profile.prof）
+            或 'tracemalloc'（内存分配，结果写入 export_profile.json），默认为 'cprofile'
+
+    返回值:
+        dict: 文本统计信息与导出信息，'录音时长' 中为录音总时长、平均时长与总时长要求的完成率，
+            '各句时长(秒)' 中为每句录音的时长，'各阶段耗时' 中为各阶段的墙钟时间、CPU 时间、
+            读写字节数与文件数（同时保存到项目目录下的 export_profile.json）
     """
     projects_dir = f'projects/{project_name}'
+    manifest_path = f'{projects_dir}/export_manifest.json'
+    target_format = (frame_rate, channels, sample_width)
+    params = {'silence_thresh': silence_thresh, 'keep_silence': keep_silence, 'volume_boost': volume_boost, 'target_format': list(target_format)}
+    profiler = StageProfiler(profile_stage, profile_tool, f'{projects_dir}/export_profile.prof')
     
-    # 读取数据
-    sentences = read_json(json_file)
-    print("句子数:", len(sentences))
-    
-    # 查找WAV文件
-    wav_files = find_wav_files(wav_dir)
-    print("WAV文件数:", len(wav_files))
-    print("完成率:", f"{len(wav_files)/len(sentences)*100:.2f}%")
-
-    # 整理数据到项目文件
-    slicer_opt_path = f'{projects_dir}/gptsovits_dataset/slicer_opt'
-    list_path = f'{projects_dir}/gptsovits_dataset/asr_opt/slicer_opt.list'
-    list_data = ""
+    with profiler.stage("生成列表") as record:
+        # 读取数据
+        sentences = read_json(json_file)
+        print("句子数:", len(sentences))
+        record['bytes_read'] += file_size(json_file)
+        
+        # 查找WAV文件
+        wav_files = find_wav_files(wav_dir)
+        print("WAV文件数:", len(wav_files))
+        print("完成率:", f"{len(wav_files)/len(sentences)*100:.2f}%")
+        record['files'] = len(wav_files)
+
+        # 录音时长（只读取文件头）
+        durations = {wav_file: take_duration(f"{wav_dir}/{wav_file}") for wav_file in wav_files}
+        print("录音总时长:", duration_stats(list(durations.values()))["总时长"])
+    n_recorded = len(wav_files)
+
+    # 按质量指标排除不符合要求的音频（指标有缓存，只分析新增或修改过的音频）
+    excluded = {}
+    metrics = None
+    if exclude_warnings:
+        with profiler.stage("质量分析") as record:
+            metrics = analyze_takes([f"{wav_dir}/{wav_file}" for wav_file in wav_files], progress_callback=progress_callback, should_cancel=should_cancel)
+            raise_if_cancelled(should_cancel)
+            save_quality_report(metrics, f'{projects_dir}/quality_report.csv')
+            for wav_file in wav_files:
+                warnings = metrics.get(f"{wav_dir}/{wav_file}", {}).get('warnings', [])
+                if set(warnings) & set(exclude_warnings):
+                    excluded[wav_file] = warnings
+            wav_files = [wav_file for wav_file in wav_files if wav_file not in excluded]
+            print(f"按质量排除的音频数: {len(excluded)}")
+            record['files'] = len(metrics)
+
+    with profiler.stage("生成列表") as record:
+        # 整理数据到项目文件
+        slicer_opt_path = f'{projects_dir}/gptsovits_dataset/slicer_opt'
+        list_path = f'{projects_dir}/gptsovits_dataset/asr_opt/slicer_opt.list'
+        manifest = load_json_cache(manifest_path if incremental else None)
+        tasks = []
+        signatures = {}
+        for wav_file in wav_files:
+            wav_path = f"{wav_dir}/{wav_file}"
+            copy_path = f"{slicer_opt_path}/{wav_file}"
+            signatures[wav_file] = take_signature(wav_path, params)
+            if manifest['takes'].get(wav_file) != signatures[wav_file] or not os.path.exists(copy_path):
+                tasks.append((wav_path, copy_path))
+
+        # 删除已不存在的音频对应的输出
+        for wav_file in set(manifest['takes']) - set(wav_files):
+            del manifest['takes'][wav_file]
+        removed = remove_files_except(slicer_opt_path, set(wav_files))
+        print(f"需要处理的音频数: {len(tasks)}，跳过未修改的音频数: {len(wav_files) - len(tasks)}")
+        if tasks or removed:
+            manifest['merged'] = False
+            save_json_cache(manifest, manifest_path, indent=4)
+
+    # 处理音频（单次解码：删除音频前后空白、调高音频音量、统一格式），定期保存清单以便中断后继续
+    # LIST 文件在处理结束（或取消）后才写入，只列出 slicer_opt 中已生成的音频
+    changed = set()
+    pending = {os.path.basename(copy_path) for _, copy_path in tasks}
     n = 0
-    for wav_file in wav_files:
-        n += 1
-        word = wav_file.split('.wav')[0]
-        wav_path = f"{wav_dir}/{wav_file}"
-        copy_path = f"{slicer_opt_path}/{wav_file}"
-        copy_file(wav_path, copy_path)
-        print(f"({n}/{len(wav_files)}) {wav_path} -> {copy_path}")
-        if word in sentences:
-            list_data += f"output\slicer_opt\{wav_file}|slicer_opt|ZH|{sentences[word]}\n"
-    
-    save_string_to_file(list_data, list_path)
-    print("LIST文件位置:", list_path)
-
-    # 删除音频前后空白
-    remove_silence_from_audio_files(slicer_opt_path, silence_thresh=silence_thresh, keep_silence=keep_silence)
-
-    # 调高音频音量
-    if volume_boost > 0:
-        increase_audio_volume(slicer_opt_path, volume_boost=volume_boost)
+    with profiler.stage("处理音频") as record:
+        results = iter_processed_wav_files(tasks, silence_thresh, keep_silence, volume_boost, workers, target_format)
+        try:
+            raise_if_cancelled(should_cancel)
+            for wav_path, copy_path in results:
+                n += 1
+                wav_file = os.path.basename(copy_path)
+                manifest['takes'][wav_file] = signatures[wav_file]
+                changed.add(wav_file)
+                record['files'] += 1
+                record['bytes_read'] += signatures[wav_file]['size']
+                record['bytes_written'] += file_size(copy_path)
+                print(f"({n}/{len(tasks)}) {wav_path} -> {copy_path}")
+                report_progress(progress_callback, "处理音频", n, len(tasks))
+                if n % 20 == 0:
+                    save_json_cache(manifest, manifest_path, indent=4)
+                raise_if_cancelled(should_cancel)
+        finally:
+            results.close()
+            save_json_cache(manifest, manifest_path, indent=4)
+            list_data = ""
+            for wav_file in wav_files:
+                word = wav_file.split('.wav')[0]
+                if word in sentences and (wav_file not in pending or wav_file in changed):
+                    list_data += f"output\slicer_opt\{wav_file}|slicer_opt|ZH|{sentences[word]}\n"
+            save_string_to_file(list_data, list_path)
+            print("LIST文件位置:", list_path)
+            record['bytes_written'] += len(list_data.encode('utf-8'))
 
     # 合并音频
-    merge_wav_files(slicer_opt_path, f"{projects_dir}/all.wav")
-    merge_wav_files(slicer_opt_path, f"{projects_dir}/2min.wav", 120)
+    merged_files = {
+        f"{projects_dir}/all.wav": 9999999,
+        f"{projects_dir}/2min.wav": 120,
+    }
+    with profiler.stage("合并音频") as record:
+        if not manifest.get('merged') or not all(os.path.exists(path) for path in merged_files):
+            # 2min.wav 按时长与质量选择录音：未启用质量筛选时不解码音频，只使用已缓存的质量指标
+            if metrics is None:
+                metrics = analyze_takes([f"{wav_dir}/{wav_file}" for wav_file in wav_files], cached_only=True)
+            clip_path = f"{projects_dir}/2min.wav"
+            selections = {clip_path: select_clip_takes(
+                slicer_opt_path, wav_files, sentences, merged_files[clip_path],
+                {wav_file: metrics[f"{wav_dir}/{wav_file}"] for wav_file in wav_files if f"{wav_dir}/{wav_file}" in metrics},
+            )}
+            merge_wav_files_streaming(slicer_opt_path, merged_files, progress_callback, should_cancel, selections)
+            manifest['merged'] = True
+            save_json_cache(manifest, manifest_path, indent=4)
+            record['files'] = len(wav_files)
+            record['bytes_read'] += sum(file_size(f"{slicer_opt_path}/{wav_file}") for wav_file in wav_files)
+            record['bytes_written'] += sum(file_size(path) for path in merged_files)
+        else:
+            print("音频未发生变化，跳过合并")
 
     # CosyVoice数据集
     cosyvoice_path = f'{projects_dir}/cosyvoice_dataset/libritts/LibriTTS'
@@ -316,40 +697,52 @@ def main(project_name='default', json_file='corpus/zh_corpus_v1.json', wav_dir='
     cosyvoice_test_path = f'{cosyvoice_path}/test-clean/{project_name}/all'
     cosyvoice_dev_path = f'{cosyvoice_path}/dev-clean/{project_name}/all'
     cosyvoice_train_path = f'{cosyvoice_path}/train-clean-100/{project_name}/all'
-    wav_files = find_wav_files(slicer_opt_path)
+    # 此时 slicer_opt 与 wav_dir 中的文件一一对应，直接复用开头的扫描结果，不再重新遍历目录
+    train_files = set()
+    test_files = set()
     n = 0
-    for wav_file in wav_files:
-        n += 1
-        print(f"构建CosyVoice数据集({n}/{len(wav_files)})")
-        word = wav_file.split('.wav')[0]
-        if word not in sentences:
-            continue
-        wav_name = f"{project_name}_{word}"
-        wav_path = f"{slicer_opt_path}/{wav_file}"
-        copy_path = f"{cosyvoice_train_path}/{wav_name}.wav"
-        copy_file(wav_path, copy_path)
-        text_path = f"{cosyvoice_train_path}/{wav_name}.normalized.txt"
-        save_string_to_file(sentences[word], text_path)
-        if n <= 5:
-            if n == 1:
-                tts_text = {}
-                tts_text[wav_name] = [sentences[word]]
-                save_json(tts_text, tts_text_path)
-            copy_path = f"{cosyvoice_test_path}/{wav_name}.wav"
-            copy_file(wav_path, copy_path)
-            text_path = f"{cosyvoice_test_path}/{wav_name}.normalized.txt"
-            save_string_to_file(sentences[word], text_path)
-            copy_path = f"{cosyvoice_dev_path}/{wav_name}.wav"
-            copy_file(wav_path, copy_path)
-            text_path = f"{cosyvoice_dev_path}/{wav_name}.normalized.txt"
-            save_string_to_file(sentences[word], text_path)
+    with profiler.stage("构建CosyVoice数据集") as record:
+        for wav_file in wav_files:
+            n += 1
+            raise_if_cancelled(should_cancel)
+            print(f"构建CosyVoice数据集({n}/{len(wav_files)})")
+            report_progress(progress_callback, "构建CosyVoice数据集", n, len(wav_files))
+            word = wav_file.split('.wav')[0]
+            if word not in sentences:
+                continue
+            wav_name = f"{project_name}_{word}"
+            wav_path = f"{slicer_opt_path}/{wav_file}"
+            record['files'] += 1
+            record['bytes_written'] += add_cosyvoice_item(wav_path, cosyvoice_train_path, wav_name, sentences[word], link_mode)
+            train_files.update((f"{wav_name}.wav", f"{wav_name}.normalized.txt"))
+            if n <= 5:
+                if n == 1:
+                    tts_text = {}
+                    tts_text[wav_name] = [sentences[word]]
+                    save_json(tts_text, tts_text_path)
+                record['bytes_written'] += add_cosyvoice_item(wav_path, cosyvoice_test_path, wav_name, sentences[word], link_mode)
+                record['bytes_written'] += add_cosyvoice_item(wav_path, cosyvoice_dev_path, wav_name, sentences[word], link_mode)
+                test_files.update((f"{wav_name}.wav", f"{wav_name}.normalized.txt"))
+        remove_files_except(cosyvoice_train_path, train_files)
+        remove_files_except(cosyvoice_test_path, test_files)
+        remove_files_except(cosyvoice_dev_path, test_files)
         
-    output_info = string_stats(merge_text_from_list(list_path))
+    with profiler.stage("文本统计") as record:
+        output_info = list_files_stats([list_path])
+        record['files'] = 1
+        record['bytes_read'] += file_size(list_path)
     output_info["项目名称"] = project_name
     output_info["项目目录"] = projects_dir
-    output_info["录制音频数"] = len(wav_files)
-    output_info["完成率"] = f"{len(wav_files)/len(sentences)*100:.2f}%"
+    output_info["录制音频数"] = n_recorded
+    output_info["完成率"] = f"{n_recorded/len(sentences)*100:.2f}%"
+    output_info["录音时长"] = duration_stats(list(durations.values()))
+    output_info["各句时长(秒)"] = {wav_file.split('.wav')[0]: round(duration, 2) for wav_file, duration in durations.items()}
+    if exclude_warnings:
+        output_info["按质量排除的音频"] = excluded
+    output_info["本次处理音频数"] = len(changed)
+    output_info["各阶段耗时"] = profiler.summary()
+    profiler.save(f'{projects_dir}/export_profile.json', project_name=project_name, workers=workers, link_mode=link_mode, incremental=incremental)
     return output_info
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,111 @@
+import os
+import json
+import time
+import platform
+from contextlib import contextmanager
+
+PROFILE_TOOLS = ('cprofile', 'tracemalloc')
+
+def file_size(file_path):
+    """返回文件大小(字节)，文件不存在时返回 0"""
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+def cpu_seconds():
+    """当前进程及已结束子进程（处理音频的工作进程）的 CPU 时间之和(秒)"""
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+class StageProfiler:
+    """
+    记录导出各阶段的耗时与计数器：墙钟时间、CPU 时间、读写字节数与处理的文件数。
+    可选对指定阶段启用 cProfile 或 tracemalloc。
+    """
+
+    def __init__(self, profile_stage=None, profile_tool='cprofile', profile_path=None):
+        """
+        参数:
+            profile_stage (str): 需要详细分析的阶段名称，默认为 None（不分析）
+            profile_tool (str): 'cprofile'（函数耗时）或 'tracemalloc'（内存分配），默认为 'cprofile'
+            profile_path (str): cProfile 结果文件路径（可用 pstats 或 snakeviz 查看），默认为 None
+        """
+        if profile_tool not in PROFILE_TOOLS:
+            raise ValueError(f"不支持的分析工具: {profile_tool}")
+        self.profile_stage = profile_stage
+        self.profile_tool = profile_tool
+        self.profile_path = profile_path
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        """
+        统计一个阶段，同名阶段的结果会累加。
+
+        用法:
+            with profiler.stage("处理音频") as record:
+                record['files'] += 1
+                record['bytes_read'] += ...
+        """
+        record = self.stages.setdefault(name, {
+            'wall_s': 0.0, 'cpu_s': 0.0, 'bytes_read': 0, 'bytes_written': 0, 'files': 0,
+        })
+        profiler = self._start_profile() if name == self.profile_stage else None
+        wall_start = time.perf_counter()
+        cpu_start = cpu_seconds()
+        try:
+            yield record
+        finally:
+            record['wall_s'] += time.perf_counter() - wall_start
+            record['cpu_s'] += cpu_seconds() - cpu_start
+            if profiler is not None:
+                self._stop_profile(profiler, record)
+
+    def _start_profile(self):
+        """开始详细分析"""
+        if self.profile_tool == 'tracemalloc':
+            import tracemalloc
+            tracemalloc.start()
+            return tracemalloc
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _stop_profile(self, profiler, record):
+        """结束详细分析，并将结果写入阶段记录"""
+        if self.profile_tool == 'tracemalloc':
+            snapshot = profiler.take_snapshot()
+            record['tracemalloc_peak_bytes'] = profiler.get_traced_memory()[1]
+            record['tracemalloc_top'] = [str(stat) for stat in snapshot.statistics('lineno')[:10]]
+            profiler.stop()
+            return
+        profiler.disable()
+        if self.profile_path:
+            profiler.dump_stats(self.profile_path)
+            record['profile_file'] = self.profile_path
+
+    def summary(self):
+        """
+        返回值:
+            dict: {阶段名称: 计数器}，另含 '合计'，时间保留 3 位小数
+        """
+        summary = {}
+        for name, record in self.stages.items():
+            summary[name] = dict(record, wall_s=round(record['wall_s'], 3), cpu_s=round(record['cpu_s'], 3))
+        summary['合计'] = {
+            key: round(sum(record[key] for record in self.stages.values()), 3)
+            for key in ('wall_s', 'cpu_s', 'bytes_read', 'bytes_written', 'files')
+        }
+        return summary
+
+    def save(self, file_path, **meta):
+        """将各阶段统计保存为 JSON 文件"""
+        data = {
+            'meta': dict(meta, python=platform.python_version(), platform=platform.platform(), cpu_count=os.cpu_count()),
+            'stages': self.summary(),
+        }
+        os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
@@ -0,0 +1,189 @@
+"""
+批量录音质量检查：逐个音频计算峰值、有效语音 RMS、底噪、削波采样数、信噪比与时长，
+结果按文件的修改时间与大小缓存，并可生成可排序的 CSV 报告。
+
+用法（在项目根目录下运行）:
+    python -m src.quality wav --report quality_report.csv --sort snr_db
+"""
+import os
+import csv
+import sys
+import argparse
+from pathlib import Path
+import numpy as np
+from src.audio import check_level_targets, noise_floor, CLIPPING_DB, NOISE_FLOOR_LIMIT_DB, LEVEL_BLOCK_SECONDS
+from src.wavio import read_wav
+from src.tools import load_json_cache, save_json_cache
+
+QUALITY_CACHE_PATH = ".cache/quality.json"
+
+# 报告的列：(指标键, 表头)
+REPORT_COLUMNS = (
+    ('duration', '时长(秒)'),
+    ('peak_db', '峰值(dBFS)'),
+    ('max_volume_db', '最大音量(dB)'),
+    ('active_rms_db', '有效语音RMS(dB)'),
+    ('noise_floor_db', '底噪(dB)'),
+    ('snr_db', '信噪比(dB)'),
+    ('clipped_samples', '削波采样数'),
+)
+SORT_KEYS = tuple(key for key, _ in REPORT_COLUMNS)
+
+def to_db(power):
+    """功率（均方值）转换为 dB，功率为 0 时返回 -inf"""
+    return float(10 * np.log10(power)) if power > 0 else -float('inf')
+
+def analyze_take(file_path):
+    """
+    一次读取并分析单个音频的质量指标。按 10ms 块计算电平（所有声道），
+    以第 10 百分位估计底噪，高于 -30dB 的块视为有效语音。
+
+    参数:
+        file_path (str): .wav 文件路径
+
+    返回值:
+        dict: 包含以下键
+            - duration (float): 时长(秒)
+            - peak_db (float): 采样峰值(dBFS)
+            - max_volume_db (float): 最大音量(dB)，即最响的 10ms 块的电平
+            - active_rms_db (float): 有效语音部分的 RMS(dB)
+            - noise_floor_db (float): 底噪(dB)
+            - snr_db (float): 估计信噪比(dB)，即有效语音 RMS 与底噪之差
+            - clipped_samples (int): 达到削波阈值的采样数
+            - warnings (list): 不符合录制要求的提示（见 check_level_targets）
+    """
+    samples, frame_rate, sample_width = read_wav(file_path)
+    # 归一化到 [-1, 1)
+    data = samples.astype(np.float32)
+    data /= np.float32(2 ** (8 * sample_width - 1))
+    magnitude = np.abs(data)
+    max_sample = float(magnitude.max()) if magnitude.size else 0.0
+
+    # 每块所有声道的均方值，不足一块的末尾部分单独成块
+    block_size = max(1, int(frame_rate * LEVEL_BLOCK_SECONDS))
+    power = np.square(data).mean(axis=1)
+    starts = np.arange(0, len(power), block_size)
+    if len(starts):
+        block_power = np.add.reduceat(power, starts, dtype=np.float64) / np.diff(np.append(starts, len(power)))
+    else:
+        block_power = np.zeros(0)
+    levels = 10 * np.log10(np.maximum(block_power, 1e-20))
+
+    active = levels > NOISE_FLOOR_LIMIT_DB
+    max_volume = float(levels.max()) if len(levels) else -float('inf')
+    floor = noise_floor(levels)
+    active_rms = to_db(float(block_power[active].mean())) if active.any() else -float('inf')
+    peak = 20 * np.log10(max_sample) if max_sample > 0 else -float('inf')
+
+    return {
+        'duration': len(samples) / frame_rate,
+        'peak_db': float(peak),
+        'max_volume_db': max_volume,
+        'active_rms_db': active_rms,
+        'noise_floor_db': floor,
+        'snr_db': active_rms - floor if active.any() else 0.0,
+        'clipped_samples': int(np.count_nonzero(magnitude >= np.float32(10 ** (CLIPPING_DB / 20)))),
+        'warnings': check_level_targets(max_volume, floor, peak),
+    }
+
+def quality_score(metrics):
+    """
+    将质量指标换算为 0~1 的评分，用于选择录音：削波或底噪过高为 0，
+    其余按信噪比计算（40dB 及以上为 1）。
+
+    参数:
+        metrics (dict): analyze_take 的返回值
+
+    返回值:
+        float: 质量评分
+    """
+    if {'削波', '底噪过高'} & set(metrics['warnings']):
+        return 0.0
+    return min(max(metrics['snr_db'] / 40, 0.05), 1.0)
+
+def analyze_takes(file_paths, cache_path=QUALITY_CACHE_PATH, progress_callback=None, should_cancel=None, cached_only=False):
+    """
+    批量分析音频质量，只分析新增或修改过的文件，其余直接使用缓存。
+
+    参数:
+        file_paths (list): .wav 文件路径列表
+        cache_path (str): 缓存文件路径，默认为 .cache/quality.json；为 None 时不使用缓存
+        progress_callback (callable): 进度回调 progress_callback(阶段名称, 已完成数, 总数)，默认为 None
+        should_cancel (callable): 返回 True 时停止分析（已分析的结果仍写入缓存），默认为 None
+        cached_only (bool): 只返回缓存中仍有效的结果，不读取任何音频，默认为 False
+
+    返回值:
+        dict: {文件路径: analyze_take 的返回值}，无法读取（或 cached_only 时没有缓存）的文件不包含在内
+    """
+    cache = load_json_cache(cache_path)
+    results = {}
+    analyzed = 0
+    for i, file_path in enumerate(file_paths, 1):
+        if should_cancel is not None and should_cancel():
+            break
+        key = os.path.abspath(file_path)
+        try:
+            stat = os.stat(file_path)
+            entry = cache['takes'].get(key)
+            if entry is None or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+                if cached_only:
+                    continue
+                entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'metrics': analyze_take(file_path)}
+                cache['takes'][key] = entry
+                analyzed += 1
+            results[file_path] = entry['metrics']
+        except Exception as e:
+            print(f"[警告] 无法分析 {file_path}: {e}")
+        if progress_callback is not None and not cached_only:
+            progress_callback("质量分析", i, len(file_paths))
+
+    if cached_only:
+        return results
+    print(f"质量分析: 新分析 {analyzed} 个音频，使用缓存 {len(results) - analyzed} 个")
+    if cache_path and analyzed:
+        save_json_cache(cache, cache_path)
+    return results
+
+def save_quality_report(metrics, file_path, sort_by='snr_db', descending=False):
+    """
+    将质量指标保存为 CSV 报告（UTF-8 BOM，可直接用 Excel 打开并排序），不符合要求的音频在“问题”列中标出。
+
+    参数:
+        metrics (dict): analyze_takes 的返回值
+        file_path (str): 报告路径
+        sort_by (str): 排序依据的指标，默认为 'snr_db'（信噪比从低到高，问题最大的在前）
+        descending (bool): 是否降序，默认为 False
+    """
+    rows = sorted(metrics.items(), key=lambda item: item[1][sort_by], reverse=descending)
+    Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['文件'] + [title for _, title in REPORT_COLUMNS] + ['问题'])
+        for take_path, take in rows:
+            values = [take[key] if isinstance(take[key], int) else round(take[key], 2) for key, _ in REPORT_COLUMNS]
+            writer.writerow([os.path.basename(take_path)] + values + ["、".join(take['warnings'])])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批量检查录音质量并生成报告")
+    parser.add_argument('wav_dir', nargs='?', default='wav', help="音频目录，默认为 wav")
+    parser.add_argument('--report', default='quality_report.csv', help="报告路径，默认为 quality_report.csv")
+    parser.add_argument('--sort', choices=SORT_KEYS, default='snr_db', help="排序依据，默认为 snr_db")
+    parser.add_argument('--descending', action='store_true', help="降序排列")
+    parser.add_argument('--cache', default=QUALITY_CACHE_PATH, help=f"缓存文件路径，默认为 {QUALITY_CACHE_PATH}")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.wav_dir):
+        print(f"[错误] 音频目录 {args.wav_dir} 不存在")
+        return 1
+    file_paths = sorted(os.path.join(args.wav_dir, f) for f in os.listdir(args.wav_dir) if f.lower().endswith('.wav'))
+    metrics = analyze_takes(file_paths, args.cache)
+    save_quality_report(metrics, args.report, args.sort, args.descending)
+
+    flagged = {path: take['warnings'] for path, take in metrics.items() if take['warnings']}
+    for path, warnings in sorted(flagged.items()):
+        print(f"{os.path.basename(path)}: {'、'.join(warnings)}")
+    print(f"共 {len(metrics)} 个音频，{len(flagged)} 个不符合录制要求，报告已保存到: {args.report}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
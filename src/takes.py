@@ -0,0 +1,154 @@
+import os
+import numpy as np
+from src.wavio import read_wav_header
+
+# 总音频时长要求（秒，见 README）
+MIN_TOTAL_DURATION = 30 * 60
+RECOMMENDED_TOTAL_DURATION = (60 * 60, 2 * 60 * 60)
+
+def take_duration(file_path):
+    """只读取文件头获取音频时长(秒)，无法解析时返回 0"""
+    try:
+        return read_wav_header(file_path)['duration']
+    except Exception:
+        return 0.0
+
+def format_duration(seconds):
+    """将秒数格式化为 时:分:秒（不足 1 小时为 分:秒）"""
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+def duration_stats(durations):
+    """
+    汇总录音时长，并计算相对 README 中总时长要求的完成率。
+
+    参数:
+        durations (list 或 np.ndarray): 各条录音的时长(秒)
+
+    返回值:
+        dict: 总时长、平均/最短/最长时长与时长要求完成率
+    """
+    durations = np.asarray(durations, dtype=np.float64)
+    total = float(durations.sum())
+    return {
+        "总时长": format_duration(total),
+        "总时长(秒)": round(total, 2),
+        "平均时长(秒)": round(float(durations.mean()), 2) if len(durations) else 0.0,
+        "最短时长(秒)": round(float(durations.min()), 2) if len(durations) else 0.0,
+        "最长时长(秒)": round(float(durations.max()), 2) if len(durations) else 0.0,
+        "最低时长要求完成率": f"{total / MIN_TOTAL_DURATION * 100:.2f}%",
+        "推荐时长完成率": f"{total / RECOMMENDED_TOTAL_DURATION[0] * 100:.2f}%",
+    }
+
+class TakeIndex:
+    """
+    已录制音频的内存索引：以布尔数组记录每个句子是否已有录音，以及各录音的时长（只读取文件头）。
+    启动时只扫描一次目录，之后通过 rescan / set_recorded 增量更新，
+    只有修改时间或大小变化的文件才重新读取文件头。
+    """
+
+    def __init__(self, keys, wav_dir):
+        """
+        参数:
+            keys (list): 句子编号列表（与界面中的顺序一致）
+            wav_dir (str): 音频目录
+        """
+        self.keys = list(keys)
+        self.wav_dir = wav_dir
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        self.recorded = np.zeros(len(self.keys), dtype=bool)
+        self.recorded_count = 0
+        self.durations = np.zeros(len(self.keys), dtype=np.float64)
+        self.signatures = {}  # 句子序号 -> (修改时间, 文件大小)
+        self.rescan()
+
+    def rescan(self):
+        """
+        重新扫描音频目录（一次 os.scandir），同步索引。
+
+        返回值:
+            list: 状态发生变化（新增、删除或重新录制）的句子序号
+        """
+        recorded = np.zeros(len(self.keys), dtype=bool)
+        modified = []
+        try:
+            with os.scandir(self.wav_dir) as entries:
+                for entry in entries:
+                    if entry.name.lower().endswith('.wav') and entry.is_file():
+                        position = self.positions.get(entry.name[:-4])
+                        if position is not None:
+                            recorded[position] = True
+                            if self._update_duration(position, entry.path, entry.stat()):
+                                modified.append(position)
+        except FileNotFoundError:
+            pass
+        changed = np.flatnonzero(recorded != self.recorded).tolist()
+        changed.extend(position for position in modified if self.recorded[position] and recorded[position])
+        for position in np.flatnonzero(~recorded & self.recorded):
+            self._clear_duration(position)
+        self.recorded = recorded
+        self.recorded_count = int(np.count_nonzero(recorded))
+        return sorted(changed)
+
+    def _update_duration(self, position, file_path, stat):
+        """文件签名变化时重新读取时长，返回是否发生变化"""
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self.signatures.get(position) == signature:
+            return False
+        self.signatures[position] = signature
+        self.durations[position] = take_duration(file_path)
+        return True
+
+    def _clear_duration(self, position):
+        """清除已删除录音的时长"""
+        self.signatures.pop(int(position), None)
+        self.durations[position] = 0.0
+
+    def set_recorded(self, key, recorded=True):
+        """更新单个句子的录制状态与时长"""
+        position = self.positions.get(key)
+        if position is None:
+            return
+        if recorded:
+            file_path = os.path.join(self.wav_dir, f"{key}.wav")
+            try:
+                self._update_duration(position, file_path, os.stat(file_path))
+            except OSError:
+                pass
+        else:
+            self._clear_duration(position)
+        if self.recorded[position] == recorded:
+            return
+        self.recorded[position] = recorded
+        self.recorded_count += 1 if recorded else -1
+
+    def is_recorded(self, index):
+        """第 index 句是否已录制"""
+        return bool(self.recorded[index])
+
+    def duration(self, index):
+        """第 index 句的录音时长(秒)，未录制时为 0"""
+        return float(self.durations[index])
+
+    def total_duration(self):
+        """已录制音频的总时长(秒)"""
+        return float(self.durations.sum())
+
+    def average_duration(self):
+        """已录制音频的平均时长(秒)"""
+        return self.total_duration() / self.recorded_count if self.recorded_count else 0.0
+
+    def completion_rate(self):
+        """完成率(0~1)"""
+        return self.recorded_count / len(self.keys) if self.keys else 0.0
+
+    def next_unrecorded(self, index):
+        """返回 index 之后第一个未录制句子的序号，没有则返回 None"""
+        remaining = np.flatnonzero(~self.recorded[index + 1:])
+        return index + 1 + int(remaining[0]) if len(remaining) > 0 else None
+
+    def previous_unrecorded(self, index):
+        """返回 index 之前最后一个未录制句子的序号，没有则返回 None"""
+        remaining = np.flatnonzero(~self.recorded[:max(index, 0)])
+        return int(remaining[-1]) if len(remaining) > 0 else None
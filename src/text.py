@@ -0,0 +1,137 @@
+import re
+from collections import Counter
+
+# 所有中文字符（包括基本汉字和扩展汉字区）
+HANZI_PATTERN = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf\U00020000-\U0002a6df\U0002a700-\U0002b73f\U0002b740-\U0002b81f\U0002b820-\U0002ceaf]')
+
+# 常见中英文标点
+PUNCTUATION_PATTERN = re.compile(r'[，。！？、；："\'‘’“”《》【】（）〔〕…—~`!@#$%^&*()_+\-=\[\]{};:\\|,.<>/?]')
+
+CHINESE_DIGITS = "零一二三四五六七八九十百千万亿兆"
+GBK_HANZI_COUNT = 21886  # GBK收录21886个汉字，含简体、繁体及部分异体字
+
+def is_hanzi(char):
+    """是否为汉字"""
+    return HANZI_PATTERN.match(char) is not None
+
+def merge_text_from_list(file_path):
+    """解析.list文件，合并成一个文本并返回"""
+    merged_text = ""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                text = line.split('|')[-1]
+                if text:
+                    merged_text += text
+    except FileNotFoundError:
+        print(f"[错误] 文件 {file_path} 未找到")
+        return ""
+    except Exception as e:
+        print(f"[错误] 读取文件时出错: {e}")
+        return ""
+    return merged_text
+
+def count_chars_from_list(file_path, char_counter=None):
+    """
+    逐行统计.list文件中文本的字符频率，不构建合并后的文本。
+
+    参数:
+        file_path (str): .list 文件路径
+        char_counter (Counter): 累加到该计数器中，默认为 None（新建）
+
+    返回值:
+        Counter: 字符频率
+    """
+    if char_counter is None:
+        char_counter = Counter()
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    char_counter.update(line.split('|')[-1])
+    except FileNotFoundError:
+        print(f"[错误] 文件 {file_path} 未找到")
+    except Exception as e:
+        print(f"[错误] 读取文件时出错: {e}")
+    return char_counter
+
+def stats_from_char_counts(char_counter):
+    """
+    根据字符频率计算文本统计信息。每个不同的字符只分类一次，
+    耗时只与字符种类数有关，与文本长度无关。
+
+    参数:
+        char_counter (Counter): 字符频率
+
+    返回值:
+        dict: 与 string_stats 相同
+    """
+    total_chars = 0
+    total_hanzi = 0
+    unique_hanzi = 0
+    found_digits = 0
+    digit_count = 0
+    letter_count = 0
+    punctuation_count = 0
+    for char, count in char_counter.items():
+        total_chars += count
+        if is_hanzi(char):
+            total_hanzi += count
+            unique_hanzi += 1
+            if char in CHINESE_DIGITS:
+                found_digits += 1
+        elif char.isalpha():
+            letter_count += count
+        if char.isdigit():
+            digit_count += count
+        if PUNCTUATION_PATTERN.match(char):
+            punctuation_count += count
+
+    hanzi_coverage = unique_hanzi / GBK_HANZI_COUNT
+    digit_coverage = found_digits / len(CHINESE_DIGITS)
+
+    return {
+        '总字符数': total_chars,
+        '不重复字符数': len(char_counter),
+        '字符频率': dict(char_counter.most_common()),
+        '总汉字数': total_hanzi,
+        '不重复汉字数': unique_hanzi,
+        'GBK汉字覆盖率': f"{round(hanzi_coverage, 4) * 100}%",
+        '中文数字覆盖率': f"{round(digit_coverage, 4) * 100}%",
+        '空格数': char_counter[' '],
+        '阿拉伯数字数': digit_count,
+        '字母数': letter_count,
+        '标点符号数': punctuation_count,
+    }
+
+def string_stats(text):
+    """
+    统计文本的字符、汉字、数字、字母与标点信息。
+
+    参数:
+        text (str): 文本
+
+    返回值:
+        dict: 总字符数、不重复字符数、字符频率（从多到少排列）、汉字数与覆盖率等
+    """
+    return stats_from_char_counts(Counter(text))
+
+def list_files_stats(file_paths):
+    """
+    流式统计多个.list文件的文本信息，结果与
+    string_stats(合并后的全部文本) 相同。
+
+    参数:
+        file_paths (list): .list 文件路径列表
+
+    返回值:
+        dict: 与 string_stats 相同
+    """
+    char_counter = Counter()
+    for file_path in file_paths:
+        count_chars_from_list(file_path, char_counter)
+    return stats_from_char_counts(char_counter)
@@ -1,6 +1,4 @@
 import json
-from PyQt6.QtCore import QUrl
-from PyQt6.QtGui import QDesktopServices
 import os
 import re
 
@@ -61,6 +59,41 @@ def load_sentences(file_path="corpus/zh_corpus_v1.json"):
         print("[错误] {file_path} 文件格式不正确，无法加载句子数据")
         return {}
 
+def load_json_cache(file_path=None):
+    """
+    读取按音频记录结果的 JSON 缓存（如导出清单、质量指标缓存），结果放在 'takes' 键下。
+
+    参数:
+        file_path (str): 缓存文件路径，默认为 None（不读取，直接返回空缓存）
+
+    返回值:
+        dict: 缓存内容；文件不存在或损坏时返回空缓存 {'version': 1, 'takes': {}}
+    """
+    if file_path:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if isinstance(cache.get('takes'), dict):
+                return cache
+        except (OSError, ValueError, AttributeError):
+            pass
+    return {'version': 1, 'takes': {}}
+
+def save_json_cache(cache, file_path, indent=None):
+    """
+    保存 JSON 缓存（先写临时文件再替换，避免中断时损坏缓存）。
+
+    参数:
+        cache (dict): 缓存内容
+        file_path (str): 缓存文件路径
+        indent (int): JSON 缩进，默认为 None（紧凑格式）
+    """
+    os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, file_path)
+
 def open_directory(directory_path):
     """
     打开指定的目录，如果路径中的父目录不存在，则递归创建它们。
@@ -75,6 +108,9 @@ def open_directory(directory_path):
     异常处理:
         - 捕获通用异常 Exception，并打印具体的错误信息
     """
+    # 延迟导入 Qt，命令行工具复用本模块时不需要安装或加载 PyQt6
+    from PyQt6.QtCore import QUrl
+    from PyQt6.QtGui import QDesktopServices
     try:
         directory_path = os.path.abspath(directory_path)
         os.makedirs(directory_path, exist_ok=True)
@@ -0,0 +1,258 @@
+import os
+import hashlib
+import threading
+import zipfile
+from collections import OrderedDict
+import numpy as np
+from src.audio import LEVEL_BLOCK_SECONDS
+
+# 流式分析时每块的采样点数（会向下取整为包络块长的整数倍）
+ANALYSIS_CHUNK_SAMPLES = 1 << 20
+
+def moving_rms_range(segment, segment_start, n, start, stop, window_size):
+    """
+    计算全长为 n 的信号在区间 [start, stop) 上的居中滑动窗口 RMS，
+    只需要传入覆盖这些窗口的片段，用于分块流式计算。
+
+    参数:
+        segment (np.ndarray): 一维 float32 片段，对应全局区间
+            [max(start - window_size // 2, 0), min(stop + (window_size - 1) // 2, n))
+        segment_start (int): 片段在全局信号中的起始位置
+        n (int): 全局信号长度
+        start (int): 需要计算的起始位置（全局）
+        stop (int): 需要计算的结束位置（全局，不含）
+        window_size (int): 窗口长度(采样点)
+
+    返回值:
+        np.ndarray: 长度为 stop - start 的 float32 数组
+    """
+    count = stop - start
+    m = len(segment)
+    # 前缀和使用 float64 累加，避免长音频的精度损失
+    cumsum = np.zeros(m + 1, dtype=np.float64)
+    np.cumsum(np.square(segment), dtype=np.float64, out=cumsum[1:])
+
+    # 窗口 [i - window_size // 2, i + (window_size - 1) // 2]，超出信号边界的部分截断
+    ahead = (window_size - 1) // 2 + 1
+    behind = window_size // 2
+    upper = np.full(count, cumsum[m])
+    hi = start + ahead - segment_start
+    tail = cumsum[hi:hi + count]
+    upper[:len(tail)] = tail
+    lo = start - behind - segment_start
+    first = max(-lo, 0)
+    upper[first:] -= cumsum[lo + first:lo + count]
+    upper /= window_size
+    np.maximum(upper, 0.0, out=upper)
+    return np.sqrt(upper).astype(np.float32)
+
+def read_wav_mmap(file_path):
+    """
+    以内存映射方式打开 .wav 文件，不支持映射的格式（如 24 位）退回为完整读取。
+
+    返回值:
+        tuple: (采样率, 采样数据)
+    """
+    from scipy.io import wavfile  # scipy 导入较慢，首次分析时才导入
+    try:
+        return wavfile.read(file_path, mmap=True)
+    except ValueError:
+        return wavfile.read(file_path)
+
+def decimate_envelope(analysis, n_buckets):
+    """
+    将包络按最小值/最大值降采样为不超过 n_buckets 个桶，用于按控件像素宽度绘图。
+
+    参数:
+        analysis (dict): analyze_wav 的返回值
+        n_buckets (int): 桶数（通常为绘图区域的像素宽度）
+
+    返回值:
+        tuple: (时间轴, dBFS)，每个桶依次给出最小值和最大值两个点
+    """
+    env_min, env_max = analysis['env_min'], analysis['env_max']
+    n_blocks = len(env_min)
+    blocks_per_bucket = max(1, -(-n_blocks // max(1, n_buckets)))
+    starts = np.arange(0, n_blocks, blocks_per_bucket)
+    if len(starts) == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.float32)
+    bucket_min = np.minimum.reduceat(env_min, starts)
+    bucket_max = np.maximum.reduceat(env_max, starts)
+    times = starts * analysis['block_size'] / analysis['sample_rate']
+    return np.repeat(times, 2), np.column_stack((bucket_min, bucket_max)).ravel()
+
+def analyze_wav(file_path):
+    """
+    分析 .wav 文件的 dBFS 包络与音量统计信息。
+
+    参数:
+        file_path (str): .wav 文件路径
+
+    返回值:
+        dict: 包含以下键
+            - sample_rate (int): 采样率
+            - duration (float): 总时长(秒)
+            - block_size (int): 包络每块的采样点数
+            - env_min (np.ndarray): 每块的最小 dBFS
+            - env_max (np.ndarray): 每块的最大 dBFS
+            - avg_volume (float): 平均音量(dB)，-30dB 以下视为静音不参与统计
+            - max_volume (float): 最大音量(dB)
+    """
+    sample_rate, data = read_wav_mmap(file_path)
+    data = data[:, 0] if len(data.shape) > 1 else data  # 单声道处理
+    original_dtype = data.dtype
+    scale = np.float32(np.iinfo(original_dtype).max) if np.issubdtype(original_dtype, np.integer) else None
+    n = len(data)
+
+    window_size = max(1, int(sample_rate * 0.01))  # 10ms窗口
+    block_size = max(1, int(sample_rate * LEVEL_BLOCK_SECONDS))
+    chunk_size = block_size * max(1, ANALYSIS_CHUNK_SAMPLES // block_size)
+    ahead = (window_size - 1) // 2
+    behind = window_size // 2
+
+    # 分块流式计算，峰值内存只与块大小有关
+    voiced_sum = 0.0
+    voiced_count = 0
+    max_volume = -float('inf')
+    env_mins, env_maxs = [], []
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        segment_start = max(start - behind, 0)
+        segment = np.asarray(data[segment_start:min(stop + ahead, n)], dtype=np.float32)
+
+        # 数据标准化
+        if scale is not None:
+            segment /= scale
+
+        # 计算RMS值（平均音量）
+        rms = moving_rms_range(segment, segment_start, n, start, stop, window_size)
+
+        # dBFS转换
+        np.maximum(rms, np.float32(1e-10), out=rms)
+        data_db = np.log10(rms, out=rms)
+        data_db *= 20
+        np.minimum(data_db, 0.0, out=data_db) # 将最大值限制在0dBFS
+
+        # 统计信息（过滤掉-30dB以下的数据，视为静音）
+        filtered_data_db = data_db[data_db >= -30]
+        if len(filtered_data_db) > 0:
+            voiced_sum += float(np.sum(filtered_data_db, dtype=np.float64))
+            voiced_count += len(filtered_data_db)
+            max_volume = max(max_volume, float(np.max(filtered_data_db)))
+
+        # 按块降采样，保留每块的最小值与最大值
+        starts = np.arange(0, len(data_db), block_size)
+        env_mins.append(np.minimum.reduceat(data_db, starts))
+        env_maxs.append(np.maximum.reduceat(data_db, starts))
+
+    # 释放内存映射，避免文件在重新录制时被占用
+    del data
+
+    avg_volume = voiced_sum / voiced_count if voiced_count > 0 else -float('inf')
+    env_min = np.concatenate(env_mins) if env_mins else np.zeros(0, dtype=np.float32)
+    env_max = np.concatenate(env_maxs) if env_maxs else np.zeros(0, dtype=np.float32)
+
+    return {
+        'sample_rate': int(sample_rate),
+        'duration': n / sample_rate,
+        'block_size': block_size,
+        'env_min': env_min,
+        'env_max': env_max,
+        'avg_volume': float(avg_volume),
+        'max_volume': float(max_volume),
+    }
+
+def file_signature(file_path):
+    """返回文件的 (修改时间, 大小)，用于判断缓存是否失效"""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+class WaveformCache:
+    """
+    波形分析结果缓存：内存 LRU + 可选的磁盘缓存。
+
+    缓存以文件绝对路径为键，并记录文件的修改时间与大小；重新录制后签名变化，
+    旧结果自动失效。可在多个线程中同时使用。
+    """
+
+    def __init__(self, max_entries=64, cache_dir=None):
+        """
+        参数:
+            max_entries (int): 内存中最多缓存的文件数，默认为 64
+            cache_dir (str): 磁盘缓存目录，默认为 None（不使用磁盘缓存）
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sidecar_path(self, path):
+        """磁盘缓存文件路径"""
+        name = hashlib.sha1(path.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.npz")
+
+    def _load_sidecar(self, path, signature):
+        """读取磁盘缓存，签名不一致或文件损坏时返回 None"""
+        sidecar = self._sidecar_path(path)
+        try:
+            with np.load(sidecar) as f:
+                if tuple(f['signature'].tolist()) != signature:
+                    return None
+                return {
+                    'sample_rate': int(f['sample_rate']),
+                    'duration': float(f['duration']),
+                    'block_size': int(f['block_size']),
+                    'env_min': f['env_min'],
+                    'env_max': f['env_max'],
+                    'avg_volume': float(f['avg_volume']),
+                    'max_volume': float(f['max_volume']),
+                }
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+
+    def _save_sidecar(self, path, signature, analysis):
+        """写入磁盘缓存"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            sidecar = self._sidecar_path(path)
+            # 先写临时文件再替换，避免其他线程读到不完整的缓存
+            tmp_path = f"{sidecar}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, signature=np.array(signature, dtype=np.int64), **analysis)
+            os.replace(tmp_path, sidecar)
+        except OSError as e:
+            print(f"[警告] 无法写入波形缓存: {e}")
+
+    def get(self, file_path):
+        """
+        获取文件的分析结果，缓存未命中时重新分析。
+
+        参数:
+            file_path (str): .wav 文件路径
+
+        返回值:
+            dict: analyze_wav 的返回值
+        """
+        path = os.path.abspath(file_path)
+        signature = file_signature(path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        analysis = None
+        if self.cache_dir:
+            analysis = self._load_sidecar(path, signature)
+        if analysis is None:
+            analysis = analyze_wav(path)
+            if self.cache_dir:
+                self._save_sidecar(path, signature, analysis)
+
+        with self._lock:
+            self._entries[path] = (signature, analysis)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return analysis
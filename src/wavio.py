@@ -0,0 +1,143 @@
+import struct
+import wave
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+class WavFormatError(ValueError):
+    """文件不是可直接解析的 PCM / 浮点 WAV（需要 ffmpeg 转码）"""
+
+def read_wav_header(file_path):
+    """
+    只读取 .wav 文件头，不读取音频数据。
+
+    参数:
+        file_path (str): .wav 文件路径
+
+    返回值:
+        dict: 包含以下键
+            - format (int): 编码（WAVE_FORMAT_PCM 或 WAVE_FORMAT_IEEE_FLOAT，EXTENSIBLE 已展开）
+            - channels (int): 声道数
+            - frame_rate (int): 采样率
+            - sample_width (int): 采样宽度(字节)
+            - data_offset (int): 音频数据在文件中的起始位置
+            - n_frames (int): 帧数
+            - duration (float): 时长(秒)
+    """
+    with open(file_path, 'rb') as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+            raise WavFormatError(f"{file_path} 不是 RIFF/WAVE 文件")
+        f.seek(0, 2)
+        file_size = f.tell()
+        position = 12
+        fmt = None
+        while position + 8 <= file_size:
+            f.seek(position)
+            chunk_id, chunk_size = struct.unpack('<4sI', f.read(8))
+            if chunk_id == b'fmt ':
+                fmt = f.read(min(chunk_size, 40))
+            elif chunk_id == b'data':
+                if fmt is None or len(fmt) < 16:
+                    raise WavFormatError(f"{file_path} 缺少 fmt 块")
+                audio_format, channels, frame_rate, _, block_align, bits = struct.unpack('<HHIIHH', fmt[:16])
+                if audio_format == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                    audio_format = struct.unpack('<H', fmt[24:26])[0]  # SubFormat GUID 的前两个字节
+                if audio_format not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT) or channels == 0:
+                    raise WavFormatError(f"{file_path} 的编码 0x{audio_format:X} 不是 PCM")
+                sample_width = (bits + 7) // 8
+                data_offset = position + 8
+                # 录制中断时数据块长度可能未回填（0 或 0xFFFFFFFF），此时以文件实际长度为准
+                available = file_size - data_offset
+                data_size = available if chunk_size in (0, 0xFFFFFFFF) else min(chunk_size, available)
+                n_frames = data_size // (sample_width * channels)
+                return {
+                    'format': audio_format,
+                    'channels': channels,
+                    'frame_rate': frame_rate,
+                    'sample_width': sample_width,
+                    'data_offset': data_offset,
+                    'n_frames': n_frames,
+                    'duration': n_frames / frame_rate if frame_rate else 0.0,
+                }
+            position += 8 + chunk_size + (chunk_size & 1)
+    raise WavFormatError(f"{file_path} 缺少 data 块")
+
+def read_wav(file_path):
+    """
+    读取 .wav 文件为整数数组，数据格式与 pydub 一致：
+    8 位转换为有符号整数，24 位扩展为 32 位，浮点转换为 32 位整数。
+
+    参数:
+        file_path (str): .wav 文件路径
+
+    返回值:
+        tuple: (形状为 (帧数, 声道数) 的整数数组, 采样率, 采样宽度(字节))
+    """
+    header = read_wav_header(file_path)
+    channels = header['channels']
+    width = header['sample_width']
+    count = header['n_frames'] * channels
+    with open(file_path, 'rb') as f:
+        f.seek(header['data_offset'])
+        if header['format'] == WAVE_FORMAT_IEEE_FLOAT:
+            dtype = {4: '<f4', 8: '<f8'}.get(width)
+            if dtype is None:
+                raise WavFormatError(f"{file_path} 的浮点位宽 {width * 8} 不受支持")
+            data = np.fromfile(f, dtype=dtype, count=count)
+            data = np.round(np.clip(data, -1.0, 1.0) * 2147483647).astype(np.int32)
+            width = 4
+        elif width == 1:
+            data = (np.fromfile(f, dtype=np.uint8, count=count).astype(np.int16) - 128).astype(np.int8)
+        elif width == 2:
+            data = np.fromfile(f, dtype='<i2', count=count)
+        elif width == 3:
+            raw = np.fromfile(f, dtype=np.uint8, count=count * 3).reshape(-1, 3).astype(np.int32)
+            value = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+            value = np.where(value >= 1 << 23, value - (1 << 24), value)
+            # 与 pydub 的转换方式一致：原值左移 8 位，低字节按符号填充
+            data = (value << 8) | np.where(value < 0, 0xFF, 0)
+            data = data.astype(np.int32)
+            width = 4
+        elif width == 4:
+            data = np.fromfile(f, dtype='<i4', count=count)
+        else:
+            raise WavFormatError(f"{file_path} 的采样宽度 {width} 不受支持")
+    return data.reshape(-1, channels), header['frame_rate'], width
+
+def write_wav(file_path, samples, frame_rate):
+    """
+    将整数数组写为 PCM .wav 文件，文件内容与 AudioSegment.export(format="wav") 一致。
+
+    参数:
+        file_path (str): 输出路径
+        samples (np.ndarray): 形状为 (帧数, 声道数) 的 int8/int16/int32 数组
+        frame_rate (int): 采样率
+    """
+    sample_width = samples.dtype.itemsize
+    with wave.open(file_path, 'wb') as f:
+        f.setnchannels(samples.shape[1])
+        f.setsampwidth(sample_width)
+        f.setframerate(frame_rate)
+        f.setnframes(samples.shape[0])
+        f.writeframesraw(pcm_bytes(samples, sample_width))
+
+def pcm_bytes(samples, sample_width):
+    """
+    将整数数组编码为 WAV 文件中的 PCM 数据。
+
+    参数:
+        samples (np.ndarray): 形状为 (帧数, 声道数) 的 int8/int16/int32 数组（24 位数据以 int32 存放，与 read_wav 一致）
+        sample_width (int): 输出的采样宽度(字节)
+
+    返回值:
+        bytes: 小端序 PCM 数据
+    """
+    if sample_width == 1:
+        return (samples.astype(np.int16) + 128).astype(np.uint8).tobytes()  # WAV 的 8 位数据为无符号整数
+    if sample_width == 3:
+        # 取 32 位整数的高 3 个字节
+        return np.ascontiguousarray(samples, dtype='<i4').view(np.uint8).reshape(-1, 4)[:, 1:].tobytes()
+    return np.ascontiguousarray(samples).astype(samples.dtype.newbyteorder('<'), copy=False).tobytes()
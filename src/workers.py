@@ -0,0 +1,87 @@
+import os
+import threading
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+class WaveformTaskSignals(QObject):
+    """波形分析任务的信号（QRunnable 本身不能定义信号）"""
+
+    # 请求编号、文件路径、分析结果（文件不存在或分析失败时为 None）
+    finished = pyqtSignal(int, str, object)
+
+class WaveformTask(QRunnable):
+    """
+    在线程池中检查音频文件并分析波形，结果写入 WaveformCache 并通过信号返回。
+    """
+
+    def __init__(self, cache, file_path, request_id, is_stale=None):
+        """
+        参数:
+            cache (WaveformCache): 波形分析缓存
+            file_path (str): .wav 文件路径
+            request_id (int): 请求编号，用于在界面线程中丢弃过期结果
+            is_stale (callable): 开始执行前调用，返回 True 时跳过分析，默认为 None
+        """
+        super().__init__()
+        self.cache = cache
+        self.file_path = file_path
+        self.request_id = request_id
+        self.is_stale = is_stale
+        self.signals = WaveformTaskSignals()
+
+    def run(self):
+        """执行分析"""
+        analysis = None
+        if self.is_stale is None or not self.is_stale():
+            try:
+                if os.path.exists(self.file_path):
+                    analysis = self.cache.get(self.file_path)
+            except Exception as e:
+                print(f"[错误] 分析 {self.file_path} 时出错: {e}")
+        self.signals.finished.emit(self.request_id, self.file_path, analysis)
+
+class ExportTaskSignals(QObject):
+    """导出任务的信号"""
+
+    progress = pyqtSignal(str, int, int)  # 阶段名称、已完成数、总数
+    finished = pyqtSignal(dict)  # output_tool.main 的返回值
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)  # 错误信息
+
+class ExportTask(QRunnable):
+    """
+    在后台线程中执行导出（output_tool.main），通过信号报告进度，支持取消。
+    取消在当前文件处理完后生效，已完成的部分记录在导出清单中，下次导出时继续。
+    """
+
+    def __init__(self, export_function, **kwargs):
+        """
+        参数:
+            export_function (callable): 导出函数，需支持 progress_callback 与 should_cancel 参数
+            **kwargs: 传给导出函数的其他参数
+        """
+        super().__init__()
+        self.export_function = export_function
+        self.kwargs = kwargs
+        self.cancel_event = threading.Event()
+        self.signals = ExportTaskSignals()
+
+    def cancel(self):
+        """请求取消导出"""
+        self.cancel_event.set()
+
+    def run(self):
+        """执行导出"""
+        from src.output import ExportCancelled
+        try:
+            output_info = self.export_function(
+                progress_callback=self.signals.progress.emit,
+                should_cancel=self.cancel_event.is_set,
+                **self.kwargs,
+            )
+        except ExportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            print(f"[错误] 导出失败: {e}")
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(output_info)
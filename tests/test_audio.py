@@ -0,0 +1,95 @@
+"""
+src.audio 中 NumPy 实现与 pydub 的一致性测试（使用合成音频，不依赖 ffmpeg）。
+"""
+import wave
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+from pydub.silence import detect_nonsilent
+
+from src.audio import audio_segment_to_array, boost_nonsilent_array, detect_nonsilent_array, trim_silence_array
+from src.wavio import read_wav
+
+FRAME_RATE = 16000
+
+def write_clip(path, signal, sample_width, channels=1):
+    """将 [-1, 1] 范围的浮点信号写为指定采样宽度的 .wav 文件"""
+    data = np.repeat(np.asarray(signal, dtype=np.float64)[:, None], channels, axis=1)
+    scale = 2 ** (8 * sample_width - 1) - 1
+    if sample_width == 1:
+        raw = (np.round(data * scale) + 128).astype(np.uint8).tobytes()
+    elif sample_width == 3:
+        value = np.round(data * scale).astype('<i4').reshape(-1, 1).view(np.uint8)
+        raw = np.ascontiguousarray(value[:, :3]).tobytes()
+    else:
+        raw = np.round(data * scale).astype({2: '<i2', 4: '<i4'}[sample_width]).tobytes()
+    with wave.open(str(path), 'wb') as w:
+        w.setnchannels(channels)
+        w.setsampwidth(sample_width)
+        w.setframerate(FRAME_RATE)
+        w.writeframes(raw)
+    return str(path)
+
+def tone(duration_ms, amplitude=0.5):
+    t = np.arange(int(FRAME_RATE * duration_ms / 1000)) / FRAME_RATE
+    return amplitude * np.sin(2 * np.pi * 440 * t)
+
+def silence(duration_ms, amplitude=0.0005):
+    return amplitude * np.random.default_rng(duration_ms).standard_normal(int(FRAME_RATE * duration_ms / 1000))
+
+CLIPS = {
+    'all_silent': lambda: silence(600),
+    'no_silence': lambda: tone(600),
+    'shorter_than_min_silence_len': lambda: tone(30),
+    'speech_with_pauses': lambda: np.concatenate((silence(300), tone(200), silence(120), tone(150, 0.2), silence(40), tone(80), silence(250))),
+}
+
+@pytest.fixture(params=[1, 2, 3, 4], ids=lambda width: f"{width * 8}bit")
+def sample_width(request):
+    return request.param
+
+@pytest.fixture(params=sorted(CLIPS))
+def clip(request, tmp_path, sample_width):
+    path = write_clip(tmp_path / f"{request.param}.wav", CLIPS[request.param](), sample_width, channels=1 + (sample_width % 2))
+    samples, frame_rate, width = read_wav(path)
+    return AudioSegment.from_wav(path), samples, frame_rate, width
+
+def test_read_wav_matches_pydub(clip):
+    audio, samples, frame_rate, width = clip
+    assert (frame_rate, width) == (audio.frame_rate, audio.sample_width)
+    np.testing.assert_array_equal(samples, audio_segment_to_array(audio))
+
+@pytest.mark.parametrize('min_silence_len, silence_thresh', [(50, -40), (100, -30), (1000, -16)])
+def test_detect_nonsilent_array_matches_pydub(clip, min_silence_len, silence_thresh):
+    audio, samples, frame_rate, width = clip
+    expected = detect_nonsilent(audio, min_silence_len=min_silence_len, silence_thresh=silence_thresh)
+    assert detect_nonsilent_array(samples, frame_rate, width, min_silence_len, silence_thresh) == expected
+
+@pytest.mark.parametrize('keep_silence', [0, 200, 0.05])
+def test_trim_silence_array_matches_pydub(clip, keep_silence):
+    audio, samples, frame_rate, width = clip
+    trimmed = trim_silence_array(samples, frame_rate, width, silence_thresh=-40, keep_silence=keep_silence)
+
+    keep_ms = int(keep_silence * 1000) if isinstance(keep_silence, float) else keep_silence
+    parts = detect_nonsilent(audio, min_silence_len=50, silence_thresh=-40)
+    if not parts:
+        assert trimmed is None
+        return
+    start = max(0, parts[0][0] - keep_ms)
+    end = min(len(audio), parts[-1][1] + keep_ms)
+    np.testing.assert_array_equal(trimmed, audio_segment_to_array(audio[start:end]))
+
+@pytest.mark.parametrize('volume_boost', [2, 6.5])
+def test_boost_nonsilent_array_matches_pydub(clip, volume_boost):
+    audio, samples, frame_rate, width = clip
+    boosted = boost_nonsilent_array(samples, frame_rate, width, volume_boost=volume_boost, silence_thresh=-40)
+
+    expected = audio[:0]
+    prev_end = 0
+    for start, end in detect_nonsilent(audio, min_silence_len=50, silence_thresh=-40):
+        expected += audio[prev_end:start]
+        expected += audio[start:end] + volume_boost
+        prev_end = end
+    expected += audio[prev_end:]
+    np.testing.assert_array_equal(boosted, audio_segment_to_array(expected))
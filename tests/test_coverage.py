@@ -0,0 +1,75 @@
+"""
+src.coverage 中录音选择（子集和动态规划与 2min.wav 选片）的性质测试。
+"""
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from src.coverage import UNSCORED_TAKE_SCORE, fill_duration, select_takes
+
+SENTENCES = '今天天气很好我们一起去公园散步吧春眠不觉晓处处闻啼鸟夜来风雨声花落知多少一二三四五六七八九十'
+
+def random_takes(seed, n):
+    """随机生成 n 条录音的文本、时长与质量评分"""
+    rng = np.random.default_rng(seed)
+    keys = [f"{i:04d}" for i in range(n)]
+    sentences = {key: ''.join(rng.choice(list(SENTENCES), rng.integers(3, 15))) for key in keys}
+    durations = {key: float(rng.uniform(0.5, 12.0)) for key in keys}
+    scores = {key: float(rng.choice([0.0, 0.3, 0.75, 1.0])) for key in keys if rng.random() < 0.8}
+    return sentences, durations, scores
+
+def first_fit_total(durations, target, scores=None):
+    """按 durations 顺序依次填充、直到放不下为止的总时长"""
+    total = 0.0
+    for key, duration in durations.items():
+        if duration > target or (scores is not None and scores.get(key, UNSCORED_TAKE_SCORE) <= 0):
+            continue
+        if total + duration > target:
+            break
+        total += duration
+    return total
+
+@pytest.mark.parametrize('seed', range(20))
+def test_fill_duration_is_valid_and_optimal_on_grid(seed):
+    rng = np.random.default_rng(seed)
+    durations = list(rng.integers(1, 400, rng.integers(1, 12)) / 100)
+    capacity = float(rng.integers(1, 1500) / 100)
+
+    picked = fill_duration(durations, capacity)
+    assert len(picked) == len(set(picked))
+    total = sum(durations[i] for i in picked)
+    assert total <= capacity + 1e-9
+
+    # 时长是精度的整数倍时，动态规划结果等于穷举的最优解
+    best = max((sum(c) for r in range(len(durations) + 1) for c in combinations(durations, r) if sum(c) <= capacity + 1e-9), default=0.0)
+    assert total == pytest.approx(best)
+
+def test_fill_duration_empty_and_oversized():
+    assert fill_duration([], 10) == []
+    assert fill_duration([5.0], 0) == []
+    assert fill_duration([20.0, 30.0], 10) == []
+
+@pytest.mark.parametrize('seed', range(30))
+@pytest.mark.parametrize('n, target', [(10, 30), (40, 120), (200, 120)])
+def test_select_takes_properties(seed, n, target):
+    sentences, durations, scores = random_takes(seed, n)
+    selection = select_takes(sentences, durations, target, scores)
+    keys = selection['keys']
+
+    assert len(keys) == len(set(keys))
+    assert selection['duration'] == pytest.approx(sum(durations[key] for key in keys))
+    assert selection['duration'] <= target + 1e-9
+    assert selection['duration'] >= first_fit_total(durations, target, scores) - 1e-9
+    assert all(scores.get(key, UNSCORED_TAKE_SCORE) > 0 for key in keys)
+
+def test_select_takes_prefers_scored_takes_over_unscored():
+    sentences = {'a': '春眠不觉晓', 'b': '春眠不觉晓', 'c': '春眠不觉晓'}
+    durations = {'a': 10.0, 'b': 10.0, 'c': 10.0}
+    assert select_takes(sentences, durations, 10, {'b': 0.75})['keys'] == ['b']
+    assert select_takes(sentences, durations, 10, {'b': 0.3})['keys'] == ['a']
+    assert select_takes(sentences, durations, 20, {'a': 0, 'b': 0.75})['keys'] == ['b', 'c']
+
+def test_select_takes_without_candidates():
+    assert select_takes({'a': '一'}, {'a': 30.0}, 10)['keys'] == []
+    assert select_takes({'a': '一'}, {'a': 5.0}, 10, {'a': 0.0})['keys'] == []
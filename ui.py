@@ -1,21 +1,25 @@
 import sys
+import time
+startup_time = time.perf_counter()  # 用于统计启动耗时
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QMessageBox,
-    QLabel, QPushButton, QProgressBar, QComboBox, QGridLayout, QLineEdit
+    QLabel, QPushButton, QProgressBar, QComboBox, QGridLayout, QLineEdit, QProgressDialog
 )
-from PyQt6.QtCore import Qt, QTimer, QUrl
+from PyQt6.QtCore import Qt, QTimer, QUrl, QThreadPool, QFileSystemWatcher
 from PyQt6.QtGui import QFont, QAction, QDesktopServices
-from PyQt6.QtMultimedia import QMediaRecorder, QAudioInput, QMediaFormat, QMediaCaptureSession
-from PyQt6.QtMultimedia import QMediaDevices, QMediaPlayer, QAudioOutput
 import os
-from pyqtgraph import PlotWidget
-import numpy as np
-from scipy.io import wavfile
 import src.tools as tools
-import src.output as output_tool
+from src.waveform import WaveformCache, decimate_envelope
+from src.workers import WaveformTask, ExportTask
+from src.audio import check_level_targets, NOISE_FLOOR_LIMIT_DB
+from src.takes import TakeIndex, format_duration, MIN_TOTAL_DURATION, RECOMMENDED_TOTAL_DURATION
+from src.coverage import coverage_order
 
 wav_output_path = "wav"
 corpus_file_path = "corpus/zh_corpus_v1.json"
+waveform_cache_path = ".cache/waveform"
+prefetch_radius = 2  # 预取前后各几句的波形
 
 class SentenceBrowser(QMainWindow):
     def __init__(self):
@@ -25,10 +29,71 @@ class SentenceBrowser(QMainWindow):
         self.setWindowTitle("音频录制器")
         self.setGeometry(100, 100, 1500, 600)
 
-        # 录音初始化
+        # 录音初始化（音频设备与媒体管线在窗口显示后再初始化，见 finish_startup）
         self.is_recording = False
         self.current_index = 0
+        self.recorder = None
+        self.media_player = None
+        self.audio_output = None
+        self.capture_session = None
+        self.audio_devices = []
+        self.audio_input = None
+        self.level_monitor = None  # 录制时的实时电平监测
+        self.recording_key = None  # 正在录制的句子编号
+
+        # 确保输出目录存在
+        os.makedirs(wav_output_path, exist_ok=True)
+
+        # 波形分析缓存（重新录制后自动失效）
+        self.waveform_cache = WaveformCache(cache_dir=waveform_cache_path)
+
+        # 后台波形分析线程池
+        self.analysis_pool = QThreadPool(self)
+        self.analysis_pool.setMaxThreadCount(2)
+        self.waveform_request_id = 0  # 当前句子的请求编号，用于丢弃过期结果
+        self.pending_analysis = set()  # 正在预取的文件
+
+        # 后台导出任务
+        self.export_task = None
+        self.export_dialog = None
+
+        # 加载句子数据
+        self.sentences = tools.load_sentences(corpus_file_path)
+        if not self.sentences:
+            sys.exit(1)
+        self.keys = list(self.sentences.keys())
+        self.coverage_keys = None  # 按汉字覆盖率排序的句子编号（首次使用时计算）
+
+        # 已录制音频索引（启动时扫描一次目录，之后由文件监视与录制回调增量更新）
+        self.take_index = TakeIndex(self.keys, wav_output_path)
+        self.take_watcher = QFileSystemWatcher([os.path.abspath(wav_output_path)], self)
+        self.take_watcher.directoryChanged.connect(self.on_wav_directory_changed)
+        
+        # UI初始化
+        self.center_window()
+        self.init_menu()
+        self.init_ui()
+        self.apply_style()
+
+        # 首帧显示后再完成较慢的初始化
+        QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """窗口显示后初始化音频设备、媒体管线与波形图，并输出启动耗时"""
+        self.repaint()  # 确保首帧已绘制
+        print(f"首帧显示耗时: {time.perf_counter() - startup_time:.3f} s")
+        self.init_audio()
+        self.init_waveform_plot()
+        self.update_display()
+        print(f"启动完成耗时: {time.perf_counter() - startup_time:.3f} s")
+
+    def init_audio(self):
+        """初始化录音、播放、音频输入设备与实时电平监测（QtMultimedia 在此时才导入）"""
+        from PyQt6.QtMultimedia import QMediaRecorder, QAudioInput, QMediaCaptureSession
+        from PyQt6.QtMultimedia import QMediaDevices, QMediaPlayer, QAudioOutput
+        from src.monitor import AudioLevelMonitor
         self.recorder = QMediaRecorder()
+        self.recorder.recorderStateChanged.connect(self.on_recorder_state_changed)
         self.media_player = QMediaPlayer()
         self.audio_output = QAudioOutput()
         print(f"当前音频输出设备: {self.audio_output.device().description()}")
@@ -48,20 +113,22 @@ class SentenceBrowser(QMainWindow):
             print("[警告] 没有找到可用的音频输入设备")
             self.audio_input = None
 
-        # 确保输出目录存在
-        os.makedirs(wav_output_path, exist_ok=True)
-        
-        # 加载句子数据
-        self.sentences = tools.load_sentences(corpus_file_path)
-        if not self.sentences:
-            sys.exit(1)
-        self.keys = list(self.sentences.keys())
-        
-        # UI初始化
-        self.center_window()
-        self.init_menu()
-        self.init_ui()
-        self.apply_style()
+        # 录制时的实时电平监测
+        self.level_monitor = AudioLevelMonitor(parent=self)
+        self.level_monitor.levels_updated.connect(self.update_live_levels)
+
+        self.device_combo.blockSignals(True)
+        self.device_combo.addItems([device.description() for device in self.audio_devices])
+        self.device_combo.blockSignals(False)
+
+    def init_waveform_plot(self):
+        """创建波形图（pyqtgraph 在此时才导入）"""
+        from pyqtgraph import PlotWidget
+        self.waveform_plot = PlotWidget()
+        self.waveform_plot.setLabels(left='Amplitude (dBFS)', bottom='Time (s)')
+        self.waveform_plot.setTitle("Waveform in dBFS")
+        self.waveform_curve = self.waveform_plot.plot(pen='b')  # 复用同一条曲线，避免每次重建
+        self.waveform_layout.addWidget(self.waveform_plot)
 
     def center_window(self):
         """将窗口移动到屏幕中心"""
@@ -90,6 +157,13 @@ class SentenceBrowser(QMainWindow):
         open_project_dir_action.triggered.connect(self.open_project_directory)
         file_menu.addAction(open_project_dir_action)
 
+        # 视图菜单
+        view_menu = menu_bar.addMenu("视图")
+
+        self.coverage_order_action = QAction("按汉字覆盖率排序句子", self, checkable=True)
+        self.coverage_order_action.toggled.connect(self.set_coverage_order)
+        view_menu.addAction(self.coverage_order_action)
+
         # 帮助菜单
         help_menu = menu_bar.addMenu("帮助")
 
@@ -103,6 +177,22 @@ class SentenceBrowser(QMainWindow):
         about_action.triggered.connect(lambda: self.show_about_dialog())
         help_menu.addAction(about_action)
 
+    def set_coverage_order(self, enabled):
+        """
+        切换句子顺序：按汉字覆盖率排序（优先录制能覆盖更多新汉字的句子）或语料原顺序。
+        切换后仍停留在当前句子。
+        """
+        current_key = self.keys[self.current_index] if self.keys else None
+        if enabled:
+            if self.coverage_keys is None:
+                self.coverage_keys = coverage_order(self.sentences)
+            self.keys = list(self.coverage_keys)
+        else:
+            self.keys = list(self.sentences.keys())
+        self.take_index = TakeIndex(self.keys, wav_output_path)
+        self.current_index = self.take_index.positions.get(current_key, 0)
+        self.update_display()
+
     def open_audio_directory(self):
         """打开音频文件所在目录"""
         tools.open_directory(wav_output_path)
@@ -120,8 +210,9 @@ class SentenceBrowser(QMainWindow):
             output_dir = os.path.abspath(wav_output_path)
             if self.is_recording:
                 self.stop_recording()
-            self.media_player.stop()
-            self.media_player.setSource(QUrl())
+            if self.media_player is not None:  # 播放器在 finish_startup 中才创建
+                self.media_player.stop()
+                self.media_player.setSource(QUrl())
             for file in os.listdir(output_dir):
                 file_path = os.path.join(output_dir, file)
                 try:
@@ -132,13 +223,79 @@ class SentenceBrowser(QMainWindow):
             self.restart_application()
 
     def organize_training_data(self):
-        """调用 output_tool.main() 来整理训练集"""
+        """在后台线程中调用 output_tool.main() 来整理训练集，导出期间仍可继续录制"""
+        import src.output as output_tool  # 依赖 pydub，只在导出时导入
+        if self.export_task is not None:
+            QMessageBox.information(self, "正在导出", "已有导出任务正在进行，请等待完成或取消后再试。")
+            return
         project_name = self.project_name_edit.text().strip()
         if not project_name:
             project_name = "default"
-        output_tool.main(tools.make_valid_filename(project_name), corpus_file_path, wav_output_path, -40, 500, 0)
+        project_name = tools.make_valid_filename(project_name)
+
+        self.export_task = ExportTask(
+            output_tool.main,
+            project_name=project_name,
+            json_file=corpus_file_path,
+            wav_dir=wav_output_path,
+            silence_thresh=-40,
+            keep_silence=500,
+            volume_boost=0,
+        )
+        self.export_task.signals.progress.connect(self.on_export_progress)
+        self.export_task.signals.finished.connect(lambda output_info: self.on_export_finished(project_name))
+        self.export_task.signals.cancelled.connect(self.on_export_cancelled)
+        self.export_task.signals.failed.connect(self.on_export_failed)
+
+        # 非模态进度对话框
+        self.export_dialog = QProgressDialog("正在准备导出...", "取消", 0, 0, self)
+        self.export_dialog.setWindowTitle("保存到项目目录")
+        self.export_dialog.setWindowModality(Qt.WindowModality.NonModal)
+        self.export_dialog.setAutoClose(False)
+        self.export_dialog.setAutoReset(False)
+        self.export_dialog.setMinimumDuration(0)
+        self.export_dialog.canceled.connect(self.cancel_export)
+        self.export_dialog.show()
+
+        QThreadPool.globalInstance().start(self.export_task)
+
+    def on_export_progress(self, stage, current, total):
+        """更新导出进度"""
+        if self.export_dialog is None:
+            return
+        self.export_dialog.setLabelText(f"{stage} ({current}/{total})")
+        self.export_dialog.setMaximum(total)
+        self.export_dialog.setValue(current)
+
+    def cancel_export(self):
+        """请求取消导出（当前文件处理完后生效）"""
+        if self.export_task is not None:
+            self.export_task.cancel()
+            self.export_dialog.setLabelText("正在取消...")
+
+    def finish_export(self):
+        """关闭进度对话框并释放导出任务"""
+        if self.export_dialog is not None:
+            self.export_dialog.canceled.disconnect(self.cancel_export)
+            self.export_dialog.close()
+            self.export_dialog = None
+        self.export_task = None
+
+    def on_export_finished(self, project_name):
+        """导出完成"""
+        self.finish_export()
         tools.open_directory(f'projects/{project_name}')
 
+    def on_export_cancelled(self):
+        """导出已取消"""
+        self.finish_export()
+        print("导出已取消，已完成的部分将在下次导出时保留")
+
+    def on_export_failed(self, message):
+        """导出失败"""
+        self.finish_export()
+        QMessageBox.warning(self, "导出失败", message)
+
     def open_project_directory(self):
         """打开项目目录"""
         tools.open_directory("projects")
@@ -182,7 +339,6 @@ class SentenceBrowser(QMainWindow):
 
         # 录音设备下拉框
         self.device_combo = QComboBox()
-        self.device_combo.addItems([device.description() for device in self.audio_devices])
         self.device_combo.currentIndexChanged.connect(self.change_audio_device)
         layout.addWidget(self.device_combo)
         
@@ -217,9 +373,21 @@ class SentenceBrowser(QMainWindow):
         self.audio_info_label.setContentsMargins(5, 0, 0, 0)
         layout.addWidget(self.audio_info_label)
 
-        # 波形图
-        self.waveform_plot = PlotWidget()
-        layout.addWidget(self.waveform_plot)
+        # 实时电平表（-60dBFS ~ 0dBFS）
+        self.level_meter = QProgressBar(objectName="levelMeter")
+        self.level_meter.setRange(-60, 0)
+        self.level_meter.setValue(-60)
+        self.level_meter.setTextVisible(False)
+        self.level_meter.setFixedHeight(4)
+        layout.addWidget(self.level_meter)
+
+        # 波形图（占位，首帧显示后由 init_waveform_plot 创建）
+        self.waveform_plot = None
+        self.waveform_curve = None
+        waveform_container = QWidget()
+        self.waveform_layout = QVBoxLayout(waveform_container)
+        self.waveform_layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(waveform_container)
         
         # 按钮区域
         button_layout = QGridLayout()
@@ -227,6 +395,7 @@ class SentenceBrowser(QMainWindow):
         button_layout.setSpacing(10)
         
         self.prev_button = QPushButton("上一句 (←)")
+        self.prev_button.setToolTip("Shift+← 跳到上一句未录制的句子")
         self.prev_button.clicked.connect(self.show_previous)
         
         self.record_button = QPushButton("开始录制 (R)")
@@ -237,6 +406,7 @@ class SentenceBrowser(QMainWindow):
         self.play_button.setEnabled(False)  # 默认禁用，只有录音完成后才启用
         
         self.next_button = QPushButton("下一句 (→)")
+        self.next_button.setToolTip("Shift+→ 跳到下一句未录制的句子")
         self.next_button.clicked.connect(self.show_next)
         
         button_layout.addWidget(self.prev_button, 0, 0)
@@ -254,43 +424,61 @@ class SentenceBrowser(QMainWindow):
         # 显示第一句
         self.update_display()
 
-    def plot_waveform(self, file_path):
-        """绘制波形图"""
-        if not os.path.exists(file_path):
-            return self.clear_waveform()
-
-        sample_rate, data = wavfile.read(file_path)
-        data = data[:, 0] if len(data.shape) > 1 else data  # 单声道处理
-        original_dtype = data.dtype
-
-        # 数据标准化
-        data = data.astype(np.float64)
-        if np.issubdtype(original_dtype, np.integer):
-            data /= np.iinfo(original_dtype).max
-
-        # 计算RMS值（平均音量）
-        window_size = max(1, int(sample_rate * 0.01))  # 10ms窗口
-        window = np.ones(window_size) / window_size
-        rms = np.sqrt(np.convolve(data ** 2, window, 'same'))
-
-        # dBFS转换
-        epsilon = 1e-10
-        rms = np.maximum(rms, epsilon)
-        data_db = 20 * np.log10(rms)
-        data_db = np.minimum(data_db, 0.0) # 将最大值限制在0dBFS
-
-        # 统计信息
-        filtered_data_db = data_db[data_db >= -30] # 过滤掉-30dB以下的数据（视为静音）
-        avg_volume = np.mean(filtered_data_db) if len(filtered_data_db) > 0 else -float('inf')
-        max_volume = np.max(filtered_data_db) if len(filtered_data_db) > 0 else -float('inf')
-
-        # 绘图
-        self.waveform_plot.clear()
-        duration = len(data) / sample_rate  # 音频总时长(秒)
-        time_axis = np.linspace(0, duration, len(data))
-        self.waveform_plot.plot(time_axis, data_db, pen='b')
-        self.waveform_plot.setLabels(left='Amplitude (dBFS)', bottom='Time (s)')
-        self.waveform_plot.setTitle("Waveform in dBFS")
+    def audio_file_path(self, index):
+        """返回第 index 句对应的音频文件路径"""
+        return os.path.join(wav_output_path, f"{self.keys[index]}.wav")
+
+    def request_waveform(self, index, request_id=0):
+        """
+        在后台线程中分析第 index 句的音频。
+
+        参数:
+            index (int): 句子序号
+            request_id (int): 当前句子的请求编号；为 0 时表示预取，只写入缓存
+        """
+        file_path = self.audio_file_path(index)
+        if request_id:
+            # 用户已切换到其他句子时跳过
+            is_stale = lambda: self.waveform_request_id != request_id
+        else:
+            if file_path in self.pending_analysis:
+                return
+            self.pending_analysis.add(file_path)
+            # 预取的句子已离开当前句子附近时跳过
+            is_stale = lambda: abs(index - self.current_index) > prefetch_radius
+        task = WaveformTask(self.waveform_cache, file_path, request_id, is_stale)
+        task.signals.finished.connect(self.on_waveform_ready)
+        self.analysis_pool.start(task, 1 if request_id else 0)
+
+    def on_waveform_ready(self, request_id, file_path, analysis):
+        """后台分析完成，只显示当前句子的最新结果"""
+        if not request_id:
+            self.pending_analysis.discard(file_path)
+            return
+        if request_id != self.waveform_request_id or self.is_recording:
+            return
+        self.play_button.setEnabled(analysis is not None)
+        if analysis is None:
+            self.clear_waveform()
+        else:
+            self.plot_waveform(analysis)
+
+    def plot_waveform(self, analysis):
+        """
+        绘制波形图。
+
+        参数:
+            analysis (dict): WaveformCache.get 返回的分析结果
+        """
+        sample_rate = analysis['sample_rate']
+        duration = analysis['duration']  # 音频总时长(秒)
+        avg_volume = analysis['avg_volume']
+        max_volume = analysis['max_volume']
+
+        # 绘图（按绘图区域像素宽度做最小值/最大值降采样）
+        n_buckets = max(1, int(self.waveform_plot.getPlotItem().getViewBox().width()))
+        time_axis, data_db = decimate_envelope(analysis, n_buckets)
+        self.waveform_curve.setData(time_axis, data_db)
         self.waveform_plot.setXRange(0, duration)
 
         # 更新音频信息标签
@@ -300,11 +488,46 @@ class SentenceBrowser(QMainWindow):
         )
         self.audio_info_label.setText(audio_info_text)
     
+    def update_live_levels(self, level, max_volume, noise_floor, peak):
+        """
+        录制时实时更新电平表、滚动波形与音频信息标签，不符合录制要求时给出提示。
+
+        参数:
+            level (float): 当前电平(dBFS)
+            max_volume (float): 本次录制的最大音量(dB)
+            noise_floor (float): 底噪(dB)
+            peak (float): 采样峰值(dBFS)
+        """
+        self.level_meter.setValue(int(max(-60, min(0, level))))
+
+        # 滚动波形
+        time_axis, data_db = self.level_monitor.envelope()
+        self.waveform_curve.setData(time_axis, data_db)
+        if len(time_axis) > 0:
+            self.waveform_plot.setXRange(time_axis[0], time_axis[-1], padding=0)
+
+        # 尚未开始说话时不提示音量过小
+        warnings = check_level_targets(max_volume, noise_floor, peak)
+        if max_volume < NOISE_FLOOR_LIMIT_DB and "音量过小" in warnings:
+            warnings.remove("音量过小")
+        state = "warning" if warnings else "normal"
+        if self.level_meter.property("state") != state:
+            self.level_meter.setProperty("state", state)
+            self.level_meter.style().unpolish(self.level_meter)
+            self.level_meter.style().polish(self.level_meter)
+
+        audio_info_text = (
+            f"录制中 | 当前电平: {level:.2f} dB | 最大音量: {max_volume:.2f} dB | 底噪: {noise_floor:.2f} dB"
+        )
+        if warnings:
+            audio_info_text += " | ⚠ " + "、".join(warnings)
+        self.audio_info_label.setText(audio_info_text)
+
     def clear_waveform(self):
         """
         清空当前的波形图并重置音频信息标签。
         """
-        self.waveform_plot.clear()
+        self.waveform_curve.setData([], [])
         self.audio_info_label.setText("")
 
     def keyPressEvent(self, event):
@@ -314,6 +537,8 @@ class SentenceBrowser(QMainWindow):
         支持以下快捷键功能：
             - 左箭头（←）: 显示上一句待录音文本。
             - 右箭头（→）: 显示下一句待录音文本。
+            - Shift+←   : 跳到上一句未录制的文本。
+            - Shift+→   : 跳到下一句未录制的文本。
             - R 键      : 开始或停止录音操作。
             - P 键      : 播放当前句子对应的已录制音频文件。
 
@@ -322,10 +547,11 @@ class SentenceBrowser(QMainWindow):
         参数:
             event (QKeyEvent): 包含按键信息的事件对象。
         """
+        shift = bool(event.modifiers() & Qt.KeyboardModifier.ShiftModifier)
         if event.key() == Qt.Key.Key_Left:
-            self.show_previous()
+            self.show_previous_unrecorded() if shift else self.show_previous()
         elif event.key() == Qt.Key.Key_Right:
-            self.show_next()
+            self.show_next_unrecorded() if shift else self.show_next()
         elif event.key() == Qt.Key.Key_R:
             self.toggle_recording()
         elif event.key() == Qt.Key.Key_P:
@@ -340,8 +566,11 @@ class SentenceBrowser(QMainWindow):
         self.current_device_index = index
         selected_device = self.audio_devices[index]
         if self.audio_input:
+            from PyQt6.QtMultimedia import QAudioInput
             self.capture_session.setAudioInput(QAudioInput(selected_device))
             print(f"已切换到音频输入设备: {selected_device.description()}")
+            if self.level_monitor.is_active():
+                self.level_monitor.start(selected_device)
 
     def toggle_recording(self):
         """切换录制状态"""
@@ -357,8 +586,10 @@ class SentenceBrowser(QMainWindow):
             
         current_key = self.keys[self.current_index]
         output_file = os.path.join(output_dir, f"{current_key}.wav")
+        self.recording_key = current_key
         
         # 设置录音格式
+        from PyQt6.QtMultimedia import QMediaFormat
         format = QMediaFormat()
         format.setFileFormat(QMediaFormat.FileFormat.Wave)
         self.recorder.setMediaFormat(format)
@@ -367,18 +598,40 @@ class SentenceBrowser(QMainWindow):
         self.recorder.record()
         self.is_recording = True
         self.record_button.setText("停止录制 (R)")
+
+        # 开始实时监测
+        self.level_monitor.start(self.audio_devices[max(0, self.device_combo.currentIndex())])
         
     def stop_recording(self):
         """停止录制"""
         self.recorder.stop()
+        self.level_monitor.stop()
+        self.level_meter.setValue(-60)
         self.is_recording = False
         self.record_button.setText("开始录制 (R)")
         QTimer.singleShot(500, self.update_display)  # 500毫秒后执行
+
+    def on_recorder_state_changed(self, state):
+        """录制结束后立即更新索引，不必等待文件监视通知"""
+        from PyQt6.QtMultimedia import QMediaRecorder
+        if state != QMediaRecorder.RecorderState.StoppedState or self.recording_key is None:
+            return
+        output_file = os.path.join(wav_output_path, f"{self.recording_key}.wav")
+        self.take_index.set_recorded(self.recording_key, os.path.exists(output_file))
+        self.recording_key = None
+        self.update_progress()
+
+    def on_wav_directory_changed(self, path):
+        """音频目录发生变化（在外部添加或删除了音频）时重新同步索引"""
+        changed = self.take_index.rescan()
+        self.update_progress()
+        if self.current_index in changed and not self.is_recording:
+            self.update_display()
         
     def play_audio(self):
         """播放音频"""
-        if not self.keys:
-            return
+        if not self.keys or self.media_player is None:
+            return  # 播放器在 finish_startup 中才创建
         current_key = self.keys[self.current_index]
         audio_file = os.path.join(wav_output_path, f"{current_key}.wav")
         if not os.path.exists(audio_file):
@@ -406,9 +659,7 @@ class SentenceBrowser(QMainWindow):
         self.sentence_label.setText(self.sentences[current_key])
         
         # 更新进度
-        progress = (self.current_index + 1) / len(self.keys) * 100
-        self.progress_bar.setValue(int(progress))
-        self.progress_label.setText(f"{self.current_index + 1}/{len(self.keys)}")
+        self.update_progress()
         
         # 更新按钮状态
         self.prev_button.setEnabled(self.current_index > 0)
@@ -418,11 +669,38 @@ class SentenceBrowser(QMainWindow):
         if self.is_recording:
             self.stop_recording()
 
-        # 检查是否存在对应的音频文件
-        audio_file = os.path.join(wav_output_path, f"{current_key}.wav")
-        self.play_button.setEnabled(os.path.exists(audio_file))
-        self.plot_waveform(audio_file)
+        # 在后台检查并分析当前音频，同时预取前后几句，不阻塞界面
+        self.waveform_request_id += 1
+        self.play_button.setEnabled(False)
+        if self.waveform_plot is None:
+            return  # 波形图尚未创建，finish_startup 中会再次更新
+        self.request_waveform(self.current_index, self.waveform_request_id)
+        for offset in range(1, prefetch_radius + 1):
+            for index in (self.current_index + offset, self.current_index - offset):
+                if 0 <= index < len(self.keys):
+                    self.request_waveform(index)
         
+    def update_progress(self):
+        """更新进度条（录制完成率）与进度文本（含录音时长与总时长要求的完成情况，只读取文件头）"""
+        if not self.keys:
+            return
+        self.progress_bar.setRange(0, len(self.keys))
+        self.progress_bar.setValue(self.take_index.recorded_count)
+        if self.take_index.is_recorded(self.current_index):
+            status = f"已录制 {self.take_index.duration(self.current_index):.2f} s"
+        else:
+            status = "未录制"
+        total_duration = self.take_index.total_duration()
+        self.progress_label.setText(
+            f"{status} | {self.current_index + 1}/{len(self.keys)} | "
+            f"完成率: {self.take_index.recorded_count}/{len(self.keys)} "
+            f"({self.take_index.completion_rate() * 100:.2f}%) | "
+            f"总时长: {format_duration(total_duration)} (平均 {self.take_index.average_duration():.2f} s) | "
+            f"最低要求 {MIN_TOTAL_DURATION // 60} 分钟: {total_duration / MIN_TOTAL_DURATION * 100:.1f}% | "
+            f"推荐 {RECOMMENDED_TOTAL_DURATION[0] // 3600}~{RECOMMENDED_TOTAL_DURATION[1] // 3600} 小时: "
+            f"{total_duration / RECOMMENDED_TOTAL_DURATION[0] * 100:.1f}%"
+        )
+
     def show_previous(self):
         """显示上一个句子"""
         self.current_index = max(0, self.current_index - 1)
@@ -433,6 +711,24 @@ class SentenceBrowser(QMainWindow):
         self.current_index = min(len(self.keys) - 1, self.current_index + 1)
         self.update_display()
 
+    def show_previous_unrecorded(self):
+        """跳到上一句未录制的句子"""
+        index = self.take_index.previous_unrecorded(self.current_index)
+        if index is None:
+            self.statusBar().showMessage("前面没有未录制的句子", 2000)
+            return
+        self.current_index = index
+        self.update_display()
+
+    def show_next_unrecorded(self):
+        """跳到下一句未录制的句子"""
+        index = self.take_index.next_unrecorded(self.current_index)
+        if index is None:
+            self.statusBar().showMessage("后面没有未录制的句子", 2000)
+            return
+        self.current_index = index
+        self.update_display()
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)